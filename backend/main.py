@@ -7,51 +7,167 @@ Handles resume upload, interview management, and report generation.
 
 import os
 import sys
+import time
+import uuid
+import queue
+import asyncio
 import logging
-from typing import Optional
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from typing import AsyncIterator, Optional
 from pathlib import Path
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends
+import orjson
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from services.resume_analyzer import ResumeAnalyzer
+from services.resume_analyzer import DamagedPDFError, ResumeAnalyzer, spool_to_tempfile
 from services.interview_agent import InterviewAgent
-from services.assessment_engine import AssessmentEngine
+from services.assessment_engine import AssessmentEngine, preload_encoder
+from services.session_store import SessionStoreFullError, create_session_store
+from services.service_pool import ServicePool
+from services.nvidia_client import get_shared_client, max_request_seconds, shutdown_client
+from services.nim_batcher import NIMBatcher
+from config.app_config import get_app_config
+from backend.middleware import MaxBodySizeMiddleware
 from models.schemas import (
+    CandidateProfile,
+    InterviewState,
     ResumeUploadRequest,
     ResumeUploadResponse,
     InterviewMessageRequest,
     InterviewMessageResponse,
     InterviewStatusResponse,
-    InterviewReportResponse,
+    ReportJobResponse,
+    ReportStatusResponse,
     ErrorResponse
 )
 
 
-# Configure logging
+# Configure logging - records are queued and written to stdout by a
+# background listener thread so request handlers never block on log I/O
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+)
+log_listener = QueueListener(log_queue, log_stream_handler, respect_handler_level=True)
+# QueueHandler.prepare() bakes the formatted text into record.msg, so pass the
+# bare message through and let the listener's handler apply the real format
+log_queue_handler = QueueHandler(log_queue)
+log_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    handlers=[log_queue_handler]
 )
 logger = logging.getLogger(__name__)
 
 
-# In-memory session storage (use Redis in production)
-active_sessions: dict[str, InterviewAgent] = {}
+# Uploaded files are consumed in chunks of this size
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Every PDF file starts with this signature
+PDF_MAGIC = b"%PDF-"
+
+# Resume analysis failures mapped to user-facing messages, matched in order
+# against the casefolded error text
+ANALYSIS_ERROR_MESSAGES = (
+    ("nvidia_api_key", "NVIDIA API key not configured. Please set NVIDIA_API_KEY in .env file"),
+    ("api key", "NVIDIA API key not configured. Please set NVIDIA_API_KEY in .env file"),
+    ("timeout", "Request to NVIDIA API timed out. Please try again."),
+)
+
+# Lifetime of cached resume analyses and report jobs
+RESUME_CACHE_TTL_SECONDS = 24 * 60 * 60
+REPORT_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# A report job still pending after this long lost its worker (e.g. to a
+# restart) and is treated as failed; generation is a single LLM call
+REPORT_JOB_TIMEOUT_SECONDS = max_request_seconds() + 60
+# Jobs wait for a free assessment engine before generation starts, so the
+# queue wait gets its own, much looser bound
+REPORT_QUEUE_TIMEOUT_SECONDS = 30 * 60
+
+
+# Session storage (Redis, or in-memory when SESSION_BACKEND=memory)
+session_store = create_session_store(get_app_config())
+
+# Report generation tasks currently running in this worker
+report_tasks: set[asyncio.Task] = set()
+
+
+async def _sweep_sessions(interval_seconds: int):
+    """
+    Periodically evict expired (abandoned or long-completed) sessions
+    
+    Also refreshes app.state.session_count from the store, so /health can
+    report it without touching session storage.
+    """
+    while True:
+        try:
+            removed = await session_store.sweep()
+            if removed:
+                logger.info("Swept %d expired session(s)", removed)
+            app.state.session_count = await session_store.count()
+        except Exception as e:
+            logger.error("Error sweeping sessions: %s", e)
+        await asyncio.sleep(interval_seconds)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
+    log_listener.start()
     logger.info("Starting Reflexion Interviewer backend...")
+    
+    # Worker processes for CPU-bound PDF rendering, keeping the event loop free.
+    # CPUs are split between uvicorn workers, each of which runs its own pool
+    app.state.pdf_pool = ProcessPoolExecutor(
+        max_workers=max(1, (os.cpu_count() or 1) // get_app_config().worker_count),
+        mp_context=multiprocessing.get_context("spawn")
+    )
+    
+    # Reusable service instances shared across requests
+    pool_size = get_app_config().service_pool_size
+    app.state.analyzer_pool = ServicePool(
+        lambda: ResumeAnalyzer(executor=app.state.pdf_pool, batcher=app.state.batcher),
+        size=pool_size
+    )
+    app.state.assessment_pool = ServicePool(AssessmentEngine, size=pool_size)
+    
+    # Fetch the assessment tokenizer off the event loop
+    preload_encoder()
+    
+    # Coalesces interview and resume chat completions issued by concurrent requests
+    app.state.batcher = NIMBatcher(get_shared_client)
+    app.state.batcher.start()
+    
+    # Evict abandoned and completed sessions in the background
+    app.state.session_count = 0
+    sweeper = asyncio.create_task(
+        _sweep_sessions(get_app_config().session_sweep_interval_seconds)
+    )
+    
     yield
     logger.info("Shutting down Reflexion Interviewer backend...")
-    # Cleanup code here if needed
+    sweeper.cancel()
+    await asyncio.gather(sweeper, return_exceptions=True)
+    for task in report_tasks:
+        task.cancel()
+    await asyncio.gather(*report_tasks, return_exceptions=True)
+    await app.state.batcher.close()
+    await app.state.analyzer_pool.close()
+    await app.state.assessment_pool.close()
+    await session_store.close()
+    await shutdown_client()
+    app.state.pdf_pool.shutdown(cancel_futures=True)
+    log_listener.stop()
 
 
 # Initialize FastAPI app
@@ -59,7 +175,8 @@ app = FastAPI(
     title="Reflexion Interviewer API",
     description="AI-powered autonomous interview agent for technical screenings",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -71,13 +188,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Cap request bodies so oversized uploads cannot exhaust memory or disk
+app.add_middleware(
+    MaxBodySizeMiddleware,
+    max_body_size=get_app_config().max_upload_bytes
+)
+
+
+def get_batcher(request: Request) -> NIMBatcher:
+    """Dependency providing the shared NIM request batcher"""
+    return request.app.state.batcher
+
 
 # Error handlers
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
-    logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc)
+    return ORJSONResponse(
         status_code=500,
         content={"error": "Internal server error", "detail": str(exc)}
     )
@@ -87,10 +215,19 @@ async def global_exception_handler(request, exc):
 # Resume Upload Endpoint
 # ============================================
 
+async def _iter_upload(file: UploadFile, head: bytes = b"") -> AsyncIterator[bytes]:
+    """Yield an uploaded file in fixed-size chunks, after any already-read head"""
+    if head:
+        yield head
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
 @app.post("/api/upload-resume", response_model=ResumeUploadResponse)
 async def upload_resume(
     file: UploadFile = File(...),
-    job_description: str = None
+    job_description: str = None,
+    batcher: NIMBatcher = Depends(get_batcher)
 ):
     """
     Upload a resume PDF and job description to start an interview
@@ -103,54 +240,75 @@ async def upload_resume(
         if not file.filename.endswith('.pdf'):
             raise HTTPException(status_code=400, detail="File must be a PDF")
         
-        # Read file content
-        file_content = await file.read()
-        logger.info(f"Uploaded resume: {file.filename} ({len(file_content)} bytes)")
-        
         # Validate job description
         if not job_description:
             raise HTTPException(status_code=400, detail="Job description is required")
         
-        # Analyze resume
-        analyzer = ResumeAnalyzer()
+        # Oversized bodies are refused by MaxBodySizeMiddleware. The multipart
+        # body has already been received here, so this only saves copying and
+        # parsing files that are not PDFs
+        head = await file.read(len(PDF_MAGIC))
+        if head != PDF_MAGIC:
+            raise HTTPException(status_code=400, detail="File is not a valid PDF")
+        
+        # Stream the upload to disk instead of reading it into memory
+        pdf_path, pdf_digest, pdf_size = await spool_to_tempfile(_iter_upload(file, head))
+        logger.info("Uploaded resume: %s (%d bytes)", file.filename, pdf_size)
+        
+        # Analyze resume (identical PDFs reuse the cached analysis)
         try:
-            candidate_profile = await analyzer.analyze_pdf(file_content)
-            logger.info(f"Resume analyzed for: {candidate_profile.name}")
-        except Exception as e:
-            logger.error(f"Error analyzing resume: {str(e)}", exc_info=True)
-            # Provide more specific error messages
-            error_message = str(e)
-            if "poppler" in error_message.lower() or "pdftoppm" in error_message.lower():
-                raise HTTPException(
-                    status_code=500,
-                    detail="PDF processing error. Please ensure poppler-utils is installed. On macOS: brew install poppler"
-                )
-            elif "NVIDIA_API_KEY" in error_message or "API key" in error_message:
-                raise HTTPException(
-                    status_code=500,
-                    detail="NVIDIA API key not configured. Please set NVIDIA_API_KEY in .env file"
-                )
-            elif "timeout" in error_message.lower():
-                raise HTTPException(
-                    status_code=500,
-                    detail="Request to NVIDIA API timed out. Please try again."
-                )
+            cache_key = f"resume:{pdf_digest}"
+            cached_profile = await session_store.get_value(cache_key)
+            if cached_profile is not None:
+                candidate_profile = CandidateProfile.model_validate_json(cached_profile)
+                logger.info("Resume analysis cache hit for: %s", candidate_profile.name)
             else:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to process resume: {error_message}"
+                async with app.state.analyzer_pool.acquire() as analyzer:
+                    candidate_profile = await analyzer.analyze_pdf_file(pdf_path)
+                logger.info("Resume analyzed for: %s", candidate_profile.name)
+                await session_store.set_value(
+                    cache_key,
+                    candidate_profile.model_dump_json(),
+                    RESUME_CACHE_TTL_SECONDS
                 )
+        except DamagedPDFError:
+            logger.warning("Rejected damaged PDF upload: %s", file.filename)
+            raise HTTPException(
+                status_code=400,
+                detail="PDF processing error. The file appears to be damaged."
+            )
+        except Exception as e:
+            logger.error("Error analyzing resume: %s", e, exc_info=True)
+            # Provide more specific error messages; the raw error text stays in
+            # the log since it can contain server paths
+            folded_message = str(e).casefold()
+            for needle, detail in ANALYSIS_ERROR_MESSAGES:
+                if needle in folded_message:
+                    raise HTTPException(status_code=500, detail=detail)
+            raise HTTPException(status_code=500, detail="Failed to process resume")
         finally:
-            await analyzer.close()
+            os.unlink(pdf_path)
         
         # Initialize interview agent
-        agent = InterviewAgent(candidate_profile, job_description)
+        agent = InterviewAgent(
+            candidate_profile,
+            job_description,
+            batcher=batcher
+        )
         session_id = agent.session_id
         
         # Store session
-        active_sessions[session_id] = agent
+        try:
+            await session_store.save(agent)
+        except SessionStoreFullError as e:
+            logger.warning("Rejecting new session: %s", e)
+            raise HTTPException(
+                status_code=503,
+                detail="Server at capacity. Please try again later."
+            )
+        app.state.session_count += 1
         
-        logger.info(f"Interview session created: {session_id}")
+        logger.info("Interview session created: %s", session_id)
         
         return ResumeUploadResponse(
             session_id=session_id,
@@ -158,11 +316,13 @@ async def upload_resume(
             message="Resume uploaded and interview session created successfully"
         )
     
+    except HTTPException:
+        raise
     except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
+        logger.error("Validation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error uploading resume: {str(e)}")
+        logger.error("Error uploading resume: %s", e)
         raise HTTPException(status_code=500, detail="Failed to process resume")
 
 
@@ -171,152 +331,359 @@ async def upload_resume(
 # ============================================
 
 @app.post("/api/interview/message", response_model=InterviewMessageResponse)
-async def send_interview_message(request: InterviewMessageRequest):
+async def send_interview_message(
+    request: InterviewMessageRequest,
+    batcher: NIMBatcher = Depends(get_batcher)
+):
     """
     Send a message to the interview agent and receive a response
     
     This handles both candidate responses and generates the next question
     """
     try:
-        # Get session
-        agent = active_sessions.get(request.session_id)
-        if not agent:
-            raise HTTPException(status_code=404, detail="Interview session not found")
-        
-        # Process message
-        response_text = await agent.process_candidate_response(request.message)
-        
-        # Get current state
-        state = agent.get_interview_state()
+        # Serialize turns on the same session so concurrent messages cannot
+        # overwrite each other's history
+        async with session_store.lock(request.session_id):
+            # Get session
+            agent = await session_store.get(request.session_id, batcher)
+            if not agent:
+                raise HTTPException(status_code=404, detail="Interview session not found")
+            
+            # Process message
+            response_text = await agent.process_candidate_response(request.message)
+            
+            # Persist the updated session
+            await session_store.save(agent)
         
         # Determine phase name
-        phase_name = InterviewAgent.PHASES[state.current_phase - 1].name
+        phase_name = InterviewAgent._PHASE_NAMES[agent.current_phase - 1]
         
         # Check if complete
-        interview_complete = state.status == "completed"
+        interview_complete = agent.status == "completed"
         
-        # Cleanup completed sessions after a delay (in production, move to background task)
+        # Completed sessions are kept until the report is generated
         if interview_complete:
-            logger.info(f"Interview {request.session_id} completed")
+            logger.info("Interview %s completed", request.session_id)
         
-        return InterviewMessageResponse(
-            session_id=request.session_id,
-            message=response_text or "Interview completed",
-            current_phase=state.current_phase,
-            phase_name=phase_name,
-            total_questions=state.total_questions,
-            interview_complete=interview_complete
-        )
+        # Every field is already a JSON primitive, so the payload is rendered
+        # directly instead of building and re-validating InterviewMessageResponse
+        return ORJSONResponse({
+            "session_id": request.session_id,
+            "message": response_text or "Interview completed",
+            "current_phase": agent.current_phase,
+            "phase_name": phase_name,
+            "total_questions": agent.total_questions,
+            "interview_complete": interview_complete
+        })
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing interview message: {str(e)}")
+        logger.error("Error processing interview message: %s", e)
         raise HTTPException(status_code=500, detail="Failed to process message")
 
 
+def _sse_event(data: dict, event: Optional[str] = None) -> bytes:
+    """Encode one server-sent event"""
+    prefix = f"event: {event}\n".encode() if event else b""
+    return prefix + b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+@app.post("/api/interview/message/stream")
+async def stream_interview_message(request: InterviewMessageRequest):
+    """
+    Send a message to the interview agent and stream its response
+    
+    Responds with server-sent events: one event per generated fragment
+    ({"delta": ...}), then a "done" event carrying the same fields as
+    /api/interview/message, or an "error" event if generation fails.
+    """
+    # Checked before the stream starts so a missing session is still a plain 404
+    if not await session_store.get(request.session_id):
+        raise HTTPException(status_code=404, detail="Interview session not found")
+    
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async with session_store.lock(request.session_id):
+                agent = await session_store.get(request.session_id)
+                if not agent:
+                    yield _sse_event({"detail": "Interview session not found"}, event="error")
+                    return
+                
+                async for fragment in agent.process_candidate_response_stream(request.message):
+                    yield _sse_event({"delta": fragment})
+                
+                await session_store.save(agent)
+            
+            yield _sse_event({
+                "session_id": request.session_id,
+                "current_phase": agent.current_phase,
+                "phase_name": InterviewAgent._PHASE_NAMES[agent.current_phase - 1],
+                "total_questions": agent.total_questions,
+                "interview_complete": agent.status == "completed"
+            }, event="done")
+        
+        except Exception as e:
+            logger.error("Error streaming interview message: %s", e)
+            yield _sse_event({"detail": "Failed to process message"}, event="error")
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @app.get("/api/interview/status/{session_id}", response_model=InterviewStatusResponse)
 async def get_interview_status(session_id: str):
     """Get the current status of an interview session"""
     try:
-        agent = active_sessions.get(session_id)
+        agent = await session_store.get(session_id)
         if not agent:
             raise HTTPException(status_code=404, detail="Interview session not found")
         
-        state = agent.get_interview_state()
-        
+        # Read counters straight off the agent; the transcript is not materialized
         return InterviewStatusResponse(
             session_id=session_id,
-            status=state.status,
-            current_phase=state.current_phase,
-            total_questions=state.total_questions,
-            conversation_length=len(state.conversation_history),
-            started_at=state.started_at
+            status=agent.status,
+            current_phase=agent.current_phase,
+            total_questions=agent.total_questions,
+            conversation_length=agent.history_length,
+            started_at=agent.started_at
         )
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting interview status: {str(e)}")
+        logger.error("Error getting interview status: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get status")
 
 
 # ============================================
-# Report Generation Endpoint
+# Report Generation Endpoints
 # ============================================
 
-@app.get("/api/interview/report/{session_id}", response_model=InterviewReportResponse)
+def _report_job_key(report_id: str) -> str:
+    return f"report_job:{report_id}"
+
+
+def _report_job_status(job: dict) -> str:
+    """Status of a report job record, with stale pending jobs reported as failed"""
+    if job["status"] != "pending":
+        return job["status"]
+    if "started_at" in job:
+        elapsed, timeout = time.time() - job["started_at"], REPORT_JOB_TIMEOUT_SECONDS
+    else:
+        elapsed, timeout = time.time() - job.get("queued_at", 0), REPORT_QUEUE_TIMEOUT_SECONDS
+    return "failed" if elapsed > timeout else "pending"
+
+
+async def _run_report(report_id: str, cache_key: str, state: InterviewState):
+    """Generate a report in the background and record the result"""
+    job = {"status": "failed", "session_id": state.session_id}
+    try:
+        candidate_skills = []
+        if state.candidate_profile.skills:
+            candidate_skills = state.candidate_profile.skills.languages + \
+                             state.candidate_profile.skills.frameworks
+        
+        async with app.state.assessment_pool.acquire() as assessment_engine:
+            # The generation clock starts once an engine is free, not at queue time
+            await session_store.set_value(
+                _report_job_key(report_id),
+                orjson.dumps({
+                    "status": "pending",
+                    "session_id": state.session_id,
+                    "started_at": time.time()
+                }).decode(),
+                REPORT_CACHE_TTL_SECONDS
+            )
+            report = await assessment_engine.generate_report(state, candidate_skills)
+        logger.info("Report %s generated for session %s", report_id, state.session_id)
+        
+        job = {
+            "status": "done",
+            "session_id": state.session_id,
+            # orjson encodes datetimes natively, so no JSON-mode conversion pass
+            "report": report.model_dump()
+        }
+        
+        # Fallback reports (raw_analysis is None) are not reused so a retry can succeed
+        if report.raw_analysis is None:
+            await session_store.delete_value(cache_key)
+    
+    except Exception as e:
+        logger.error("Error generating report %s: %s", report_id, e)
+        await session_store.delete_value(cache_key)
+    
+    finally:
+        await session_store.set_value(
+            _report_job_key(report_id),
+            orjson.dumps(job).decode(),
+            REPORT_CACHE_TTL_SECONDS
+        )
+
+
+@app.post(
+    "/api/interview/report/{session_id}",
+    response_model=ReportJobResponse,
+    status_code=202
+)
 async def generate_interview_report(session_id: str):
-    """Generate the final assessment report for an interview"""
+    """
+    Queue generation of the final assessment report for an interview
+    
+    Returns immediately with a report_id; poll
+    /api/interview/report/{report_id}/status for the result.
+    """
     try:
-        agent = active_sessions.get(session_id)
+        agent = await session_store.get(session_id)
         if not agent:
             raise HTTPException(status_code=404, detail="Interview session not found")
         
         # Get interview state
         state = agent.get_interview_state()
         
-        # Generate report
-        assessment_engine = AssessmentEngine()
-        try:
-            candidate_skills = []
-            if state.candidate_profile.skills:
-                candidate_skills = state.candidate_profile.skills.languages + \
-                                 state.candidate_profile.skills.frameworks
-            
-            report = await assessment_engine.generate_report(state, candidate_skills)
-            logger.info(f"Report generated for session {session_id}")
-        finally:
-            await assessment_engine.close()
+        # Reports are reused per transcript length, so unchanged interviews share a job
+        cache_key = f"report:{session_id}:{agent.history_length}"
+        report_id = await session_store.get_value(cache_key)
+        if report_id is not None:
+            job_data = await session_store.get_value(_report_job_key(report_id))
+            # Stale jobs are not reused, so an orphaned job can be regenerated
+            status = _report_job_status(orjson.loads(job_data)) if job_data is not None else "failed"
+            if status != "failed":
+                logger.info("Reusing report %s for session %s", report_id, session_id)
+                return ReportJobResponse(
+                    report_id=report_id,
+                    session_id=session_id,
+                    status=status
+                )
         
-        return InterviewReportResponse(report=report)
+        # Queue a new report job
+        report_id = str(uuid.uuid4())
+        await session_store.set_value(
+            _report_job_key(report_id),
+            orjson.dumps({
+                "status": "pending",
+                "session_id": session_id,
+                "queued_at": time.time()
+            }).decode(),
+            REPORT_CACHE_TTL_SECONDS
+        )
+        await session_store.set_value(cache_key, report_id, REPORT_CACHE_TTL_SECONDS)
+        
+        task = asyncio.create_task(_run_report(report_id, cache_key, state))
+        report_tasks.add(task)
+        task.add_done_callback(report_tasks.discard)
+        
+        logger.info("Report %s queued for session %s", report_id, session_id)
+        return ReportJobResponse(report_id=report_id, session_id=session_id, status="pending")
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error generating report: {str(e)}")
+        logger.error("Error queueing report: %s", e)
         raise HTTPException(status_code=500, detail="Failed to generate report")
 
 
+@app.get("/api/interview/report/{report_id}/status", response_model=ReportStatusResponse)
+async def get_report_status(report_id: str, response: Response):
+    """
+    Get the status of a report job
+    
+    Responds with 202 while the report is pending and 200 once it is done.
+    """
+    try:
+        job_data = await session_store.get_value(_report_job_key(report_id))
+        if job_data is None:
+            raise HTTPException(status_code=404, detail="Report not found")
+        
+        job = orjson.loads(job_data)
+        status = _report_job_status(job)
+        if status == "failed":
+            raise HTTPException(status_code=500, detail="Failed to generate report")
+        if status == "pending":
+            response.status_code = 202
+        
+        return ReportStatusResponse(
+            report_id=report_id,
+            status=status,
+            report=job.get("report")
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error getting report status: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to get report status")
+
+
 # ============================================
 # Health Check
 # ============================================
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """
+    Health check endpoint
+    
+    active_sessions is maintained by the session sweeper and upload endpoint,
+    so it can lag the store by up to one sweep interval.
+    """
     return {
         "status": "healthy",
-        "active_sessions": len(active_sessions),
+        "active_sessions": app.state.session_count,
         "service": "Reflexion Interviewer API"
     }
 
 
-@app.get("/")
-async def root():
-    """Serve the frontend interface"""
-    frontend_path = Path(__file__).parent.parent / "frontend" / "index.html"
-    if frontend_path.exists():
-        return FileResponse(frontend_path)
-    return {
-        "message": "Reflexion Interviewer API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "health": "/health"
-    }
+@app.head("/health")
+async def health_check_head():
+    """Body-less health check for load balancer probes"""
+    return Response(status_code=200)
 
 
 # For debugging - get all active sessions (remove in production)
 @app.get("/debug/sessions")
 async def get_all_sessions():
     """Debug endpoint to list all active sessions"""
+    session_ids = await session_store.session_ids()
     return {
-        "session_count": len(active_sessions),
-        "session_ids": list(active_sessions.keys())
+        "session_count": len(session_ids),
+        "session_ids": session_ids
     }
 
 
+# ============================================
+# Frontend
+# ============================================
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that adds Cache-Control headers to served files"""
+    
+    HTML_MAX_AGE = 300
+    ASSET_MAX_AGE = 86400
+    
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        max_age = self.HTML_MAX_AGE if str(full_path).endswith(".html") else self.ASSET_MAX_AGE
+        response.headers["Cache-Control"] = f"public, max-age={max_age}"
+        return response
+
+
+# Mounted last so it only handles paths not matched by the API routes above
+app.mount(
+    "/",
+    CachedStaticFiles(directory=str(Path(__file__).parent.parent / "frontend"), html=True),
+    name="frontend"
+)
+
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Pools, the batcher and the HTTP client are created per worker in lifespan()
+    uvicorn.run(
+        "backend.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=get_app_config().worker_count,
+        loop="uvloop",
+        http="httptools"
+    )
 
@@ -0,0 +1,49 @@
+"""
+ASGI Middleware
+
+Request-level guards for the Reflexion Interviewer backend.
+"""
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class MaxBodySizeMiddleware:
+    """
+    Reject request bodies larger than a fixed limit
+
+    Requests that declare an oversized Content-Length are refused before any
+    of the body is read; bodies without a usable Content-Length are counted
+    as they stream in and aborted as soon as they exceed the limit.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.detail = f"Request body exceeds the {max_body_size // (1024 * 1024)} MB limit"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > self.max_body_size:
+                response = ORJSONResponse(status_code=413, content={"detail": self.detail})
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # Surfaces through FastAPI's body parsing as a normal 413 response
+                    raise HTTPException(status_code=413, detail=self.detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,111 @@
+"""
+Application Configuration
+
+This module contains configuration for the backend service itself
+(session storage, session lifetimes) as opposed to the NVIDIA API settings.
+"""
+
+import os
+from typing import Literal
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+class AppConfig(BaseSettings):
+    """Configuration for the Reflexion Interviewer backend"""
+
+    # Session Storage - "redis" shares sessions across workers, "memory" is for local dev
+    session_backend: Literal["redis", "memory"] = Field(
+        default="redis",
+        validation_alias="SESSION_BACKEND"
+    )
+    redis_url: str = Field(
+        default="redis://localhost:6379/0",
+        validation_alias="REDIS_URL"
+    )
+    redis_max_connections: int = Field(
+        default=50,
+        validation_alias="REDIS_MAX_CONNECTIONS"
+    )
+    # Hard cap for the in-memory backend; Redis is bounded by its maxmemory policy
+    max_sessions: int = Field(
+        default=1000,
+        validation_alias="MAX_SESSIONS"
+    )
+
+    # Session Lifetime - active sessions expire after this long without activity,
+    # completed sessions this long after the interview completed
+    session_timeout_minutes: int = Field(
+        default=60,
+        validation_alias="SESSION_TIMEOUT_MINUTES"
+    )
+    completed_session_retention_minutes: int = Field(
+        default=60,
+        validation_alias="COMPLETED_SESSION_RETENTION_MINUTES"
+    )
+    session_sweep_interval_seconds: int = Field(
+        default=60,
+        validation_alias="SESSION_SWEEP_INTERVAL_SECONDS"
+    )
+
+    # Service Pooling - max reused ResumeAnalyzer / AssessmentEngine instances per worker
+    service_pool_size: int = Field(
+        default=4,
+        validation_alias="SERVICE_POOL_SIZE"
+    )
+
+    # Web Server - uvicorn worker processes, 0 means one per CPU
+    web_workers: int = Field(
+        default=0,
+        validation_alias="WEB_WORKERS"
+    )
+
+    # Upload Limits
+    max_upload_mb: int = Field(
+        default=10,
+        validation_alias="MAX_UPLOAD_MB"
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",  # Ignore extra fields from .env that we don't use
+        populate_by_name=True  # Allow both field name and alias
+    )
+
+    @property
+    def session_ttl_seconds(self) -> int:
+        """Session time-to-live in seconds"""
+        return self.session_timeout_minutes * 60
+
+    @property
+    def completed_session_ttl_seconds(self) -> int:
+        """Retention of completed sessions in seconds"""
+        return self.completed_session_retention_minutes * 60
+
+    @property
+    def worker_count(self) -> int:
+        """Number of uvicorn workers to run"""
+        if self.session_backend == "memory":
+            # Workers would each hold a private, disjoint set of sessions
+            return 1
+        return self.web_workers or os.cpu_count() or 1
+
+    @property
+    def max_upload_bytes(self) -> int:
+        """Maximum accepted request body size in bytes"""
+        return self.max_upload_mb * 1024 * 1024
+
+
+# Global configuration instance
+app_config = AppConfig()
+
+
+def get_app_config() -> AppConfig:
+    """Get the application configuration instance"""
+    return app_config
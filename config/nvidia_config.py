@@ -52,6 +52,28 @@ class NVIDIAConfig(BaseSettings):
     max_tokens: int = 2048
     top_p: float = 0.9
     
+    # Local Response Cache - reuse responses to identical low-temperature requests
+    llm_cache_enabled: bool = Field(
+        default=False,
+        validation_alias="REFLEXION_LLM_CACHE"
+    )
+    llm_cache_dir: str = Field(
+        default="~/.reflexion/llm_cache",
+        validation_alias="REFLEXION_LLM_CACHE_DIR"
+    )
+    
+    # Mark the leading system message as cacheable, for backends that honor it
+    prompt_cache_hint: bool = Field(
+        default=False,
+        validation_alias="NVIDIA_PROMPT_CACHE_HINT"
+    )
+    
+    # Request JSON-mode decoding for structured extraction, for backends that support it
+    json_mode: bool = Field(
+        default=False,
+        validation_alias="NVIDIA_JSON_MODE"
+    )
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
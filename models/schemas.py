@@ -191,6 +191,20 @@ class InterviewReportResponse(BaseModel):
     report: InterviewReport = Field(description="Complete assessment report")
 
 
+class ReportJobResponse(BaseModel):
+    """Response after queueing report generation"""
+    report_id: str = Field(description="Report job identifier used for polling")
+    session_id: str = Field(description="Interview session ID")
+    status: Literal["pending", "done", "failed"] = Field(description="Report job status")
+
+
+class ReportStatusResponse(BaseModel):
+    """Response for a report job status check"""
+    report_id: str = Field(description="Report job identifier")
+    status: Literal["pending", "done", "failed"] = Field(description="Report job status")
+    report: Optional[InterviewReport] = Field(None, description="Assessment report once generated")
+
+
 class ErrorResponse(BaseModel):
     """Error response model"""
     error: str = Field(description="Error message")
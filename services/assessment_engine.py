@@ -6,10 +6,16 @@ It analyzes conversation quality, depth, and technical accuracy to provide
 objective hiring recommendations.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any
+import re
+import threading
+from typing import List, Dict, Any, Union
 from datetime import datetime
-from services.nvidia_client import NVIDIAClient
+import orjson
+from services.nvidia_client import get_shared_client
+from services.interview_phases import PHASES
+from utils.model_output import strip_json_fence
 from models.schemas import (
     InterviewState,
     InterviewReport,
@@ -18,16 +24,78 @@ from models.schemas import (
     CandidateWeaknesses
 )
 
+try:
+    import tiktoken
+except ImportError:  # Optional: prompts fall back to character limits
+    tiktoken = None
+
 
 logger = logging.getLogger(__name__)
 
 
-class AssessmentEngine:
-    """Service for generating interview assessment reports"""
+# First lines of a job description containing any of these are taken as the title
+JOB_TITLE_PATTERN = re.compile(r"engineer|developer|software|architect|scientist", re.IGNORECASE)
+
+# Number of most recent messages included in the assessment transcript
+TRANSCRIPT_WINDOW_SIZE = 20
+
+# Prompt budgets, in tokens when tiktoken is available and in characters otherwise
+MAX_TRANSCRIPT_TOKENS = 2000
+MAX_JOB_DESCRIPTION_TOKENS = 128
+MAX_TRANSCRIPT_CHARS = 3000
+MAX_JOB_DESCRIPTION_CHARS = 500
+
+
+# Tokenizer set by preload_encoder(); None until it has loaded (or if it cannot)
+_encoder = None
+
+
+def _load_encoder():
+    """Load the tokenizer, logging and leaving it unset if that fails"""
+    global _encoder
+    try:
+        _encoder = tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # The encoding is downloaded on first use, which fails offline
+        logger.warning("tiktoken encoder unavailable, using character limits: %s", e)
+
+
+def preload_encoder():
+    """
+    Start loading the tokenizer in the background
     
-    def __init__(self):
-        self.nvidia_client = NVIDIAClient()
-        self.assessment_prompt_template = """You are an expert hiring manager analyzing a technical interview transcript.
+    tiktoken downloads the encoding on first use without a timeout, so it is
+    never loaded on the event loop. A daemon thread is used so a hung
+    download cannot block shutdown either. Until it finishes, prompts are
+    trimmed with the character limits.
+    """
+    if tiktoken is not None:
+        threading.Thread(target=_load_encoder, name="tiktoken-loader", daemon=True).start()
+
+
+def _get_encoder():
+    """The tokenizer if it has loaded, else None"""
+    return _encoder
+
+
+def _truncate_head(text: str, max_tokens: int, max_chars: int) -> str:
+    """Keep the beginning of text, up to max_tokens (or max_chars without a tokenizer)"""
+    encoder = _get_encoder()
+    if encoder is None:
+        return text[:max_chars]
+    tokens = encoder.encode(text)
+    return text if len(tokens) <= max_tokens else encoder.decode(tokens[:max_tokens])
+
+
+def _truncate_tail(text: str, max_tokens: int, max_chars: int) -> str:
+    """Keep the end of text, up to max_tokens (or max_chars without a tokenizer)"""
+    encoder = _get_encoder()
+    if encoder is None:
+        return text[-max_chars:]
+    tokens = encoder.encode(text)
+    return text if len(tokens) <= max_tokens else encoder.decode(tokens[-max_tokens:])
+
+ASSESSMENT_PROMPT_TEMPLATE = """You are an expert hiring manager analyzing a technical interview transcript.
 
 Analyze the candidate's responses throughout the interview and provide a comprehensive assessment.
 
@@ -75,6 +143,19 @@ Focus on:
 - Communication clarity and articulation
 - Alignment with job requirements
 - Demonstrated skills vs. listed skills"""
+
+
+class AssessmentEngine:
+    """Service for generating interview assessment reports"""
+    
+    # Interview phases as listed in the assessment prompt
+    PHASE_BREAKDOWN = "\n".join(
+        f"- Phase {i+1}: {phase.name} - {phase.description}"
+        for i, phase in enumerate(PHASES)
+    )
+    
+    def __init__(self):
+        self.nvidia_client = get_shared_client()
     
     async def generate_report(
         self,
@@ -92,7 +173,7 @@ Focus on:
             Complete interview assessment report
         """
         try:
-            logger.info(f"Generating assessment for session {interview_state.session_id}")
+            logger.info("Generating assessment for session %s", interview_state.session_id)
             
             # Build assessment prompt
             assessment_prompt = self._build_assessment_prompt(interview_state)
@@ -127,75 +208,101 @@ Focus on:
                 raw_analysis=assessment_data
             )
             
-            logger.info(f"Assessment complete. Overall score: {report.overall_score}/10")
+            logger.info("Assessment complete. Overall score: %s/10", report.overall_score)
             return report
         
         except Exception as e:
-            logger.error(f"Error generating assessment: {str(e)}")
+            logger.error("Error generating assessment: %s", e)
             # Return a fallback report
             return self._generate_fallback_report(interview_state)
     
+    async def generate_reports(
+        self,
+        interview_states: List[InterviewState],
+        candidate_skills: List[List[str]],
+        concurrency: int = 8
+    ) -> List[Union[InterviewReport, BaseException]]:
+        """
+        Generate reports for several interviews concurrently
+        
+        Args:
+            interview_states: Interview states to assess
+            candidate_skills: Resume skills for each interview, in the same order
+            concurrency: Maximum number of assessments in flight at once,
+                to stay within provider rate limits
+        
+        Returns:
+            One report per interview, in input order; an exception takes the
+            place of a report that could not be produced
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def generate_one(state: InterviewState, skills: List[str]) -> InterviewReport:
+            async with semaphore:
+                return await self.generate_report(state, skills)
+        
+        return await asyncio.gather(
+            *[generate_one(state, skills) for state, skills in zip(interview_states, candidate_skills)],
+            return_exceptions=True
+        )
+    
     def _build_assessment_prompt(self, interview_state: InterviewState) -> str:
         """Build the assessment prompt from interview state"""
         # Extract recent conversation
-        recent_messages = interview_state.conversation_history[-20:]
-        transcript = "\n".join([
+        recent_messages = interview_state.conversation_history[-TRANSCRIPT_WINDOW_SIZE:]
+        transcript = "\n".join(
             f"{msg.role.upper()}: {msg.content}"
             for msg in recent_messages
-        ])
-        
-        # Build phase breakdown
-        phase_breakdown = "\n".join([
-            f"- Phase {i+1}: {phase.name} - {phase.description}"
-            for i, phase in enumerate(InterviewAgent.PHASES)
-        ])
+        )
         
-        return self.assessment_prompt_template.format(
-            job_description=interview_state.job_description[:500],
+        return ASSESSMENT_PROMPT_TEMPLATE.format(
+            job_description=_truncate_head(
+                interview_state.job_description,
+                MAX_JOB_DESCRIPTION_TOKENS,
+                MAX_JOB_DESCRIPTION_CHARS
+            ),
             candidate_name=interview_state.candidate_profile.name,
-            phase_breakdown=phase_breakdown,
+            phase_breakdown=self.PHASE_BREAKDOWN,
             message_count=len(recent_messages),
-            transcript=transcript[:3000]  # Limit transcript length
+            # Keep the most recent part of the transcript within budget
+            transcript=_truncate_tail(transcript, MAX_TRANSCRIPT_TOKENS, MAX_TRANSCRIPT_CHARS)
         )
     
     def _parse_assessment_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """Parse the AI assessment response"""
-        import json
-        
         response_text = self.nvidia_client.extract_response_text(response)
         
         try:
             # Try to extract JSON from markdown code blocks
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
+            response_text = strip_json_fence(response_text)
             
-            assessment_data = json.loads(response_text)
+            assessment_data = orjson.loads(response_text)
             return assessment_data
         
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse assessment JSON: {e}")
-            logger.error(f"Response: {response_text[:500]}")
+        except orjson.JSONDecodeError as e:
+            logger.error("Failed to parse assessment JSON: %s", e)
+            logger.error("Response: %.500s", response_text)
             raise ValueError("Failed to parse assessment response")
     
     def _parse_phase_scores(self, phase_data: List[Dict[str, Any]]) -> List[PhaseScore]:
         """Parse phase scores into PhaseScore objects"""
         phase_scores = []
         for phase in phase_data:
+            technical_accuracy = float(phase["technical_accuracy"])
+            problem_solving = float(phase["problem_solving"])
+            communication = float(phase["communication"])
+            depth_of_knowledge = float(phase["depth_of_knowledge"])
+            # Validated rather than model_construct()ed: scores come from model output
             score = PhaseScore(
                 phase_number=phase["phase_number"],
                 phase_name=phase["phase_name"],
-                technical_accuracy=float(phase["technical_accuracy"]),
-                problem_solving=float(phase["problem_solving"]),
-                communication=float(phase["communication"]),
-                depth_of_knowledge=float(phase["depth_of_knowledge"]),
+                technical_accuracy=technical_accuracy,
+                problem_solving=problem_solving,
+                communication=communication,
+                depth_of_knowledge=depth_of_knowledge,
                 average_score=(
-                    float(phase["technical_accuracy"]) +
-                    float(phase["problem_solving"]) +
-                    float(phase["communication"]) +
-                    float(phase["depth_of_knowledge"])
-                ) / 4.0
+                    technical_accuracy + problem_solving + communication + depth_of_knowledge
+                ) * 0.25
             )
             phase_scores.append(score)
         
@@ -204,12 +311,9 @@ Focus on:
     def _extract_job_title(self, job_description: str) -> str:
         """Extract job title from job description"""
         # Simple extraction - look for common patterns
-        lines = job_description.split('\n')
-        if lines:
-            first_line = lines[0].strip()
-            if len(first_line) < 100 and any(keyword in first_line.lower() for keyword in 
-                ['engineer', 'developer', 'software', 'architect', 'scientist']):
-                return first_line
+        first_line = job_description.partition('\n')[0].strip()
+        if len(first_line) < 100 and JOB_TITLE_PATTERN.search(first_line):
+            return first_line
         return "Software Engineer"
     
     def _generate_fallback_report(self, interview_state: InterviewState) -> InterviewReport:
@@ -232,7 +336,7 @@ Focus on:
                     depth_of_knowledge=5.0,
                     average_score=5.0
                 )
-                for i, phase in enumerate(InterviewAgent.PHASES)
+                for i, phase in enumerate(PHASES)
             ],
             strengths=CandidateStrengths(
                 top_strengths=["Completed interview successfully"],
@@ -252,7 +356,3 @@ Focus on:
         """Clean up resources"""
         await self.nvidia_client.close()
 
-
-# Import InterviewAgent for PHASES reference
-from services.interview_agent import InterviewAgent
-
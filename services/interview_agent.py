@@ -5,22 +5,50 @@ This module implements the core interview agent that manages the multi-phase
 interview process, state management, and orchestrates the conversation flow.
 """
 
+import itertools
 import logging
+import time
 import uuid
-from typing import List, Dict, Any, Optional
+from array import array
+from collections import deque
+from functools import cached_property
+from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime
-from services.nvidia_client import NVIDIAClient
+from services.nvidia_client import get_shared_client
+from services.nim_batcher import NIMBatcher
+from services.interview_phases import PHASES, PHASE_NAMES
 from models.schemas import (
     CandidateProfile,
     InterviewState,
-    InterviewMessage,
-    InterviewPhase
+    InterviewMessage
 )
 
 
 logger = logging.getLogger(__name__)
 
 
+# Message roles, stored in the history as compact integer codes. Wire-format
+# messages always reuse these (interned) strings, including after from_dict()
+ROLES = ("system", "assistant", "user")
+ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+
+# Number of most recent messages sent to the model with each prompt
+PROMPT_WINDOW_SIZE = 10
+
+# Maximum number of skills listed in the system prompt
+MAX_PROMPT_SKILLS = 30
+
+# Maximum length of the job description excerpt in the system prompt
+MAX_PROMPT_JOB_DESCRIPTION_CHARS = 1000
+
+# Trailing system message for each phase, indexed by phase_number - 1
+PHASE_INSTRUCTIONS = tuple(
+    f"Important: You are currently in Phase {phase.phase_number} of the interview. "
+    f"Stay focused on the current phase's objectives."
+    for phase in PHASES
+)
+
+
 class InterviewAgent:
     """
     Main interview agent that orchestrates the multi-phase interview process
@@ -32,66 +60,105 @@ class InterviewAgent:
     - Interview state
     """
     
-    # Phase definitions
-    PHASES = [
-        InterviewPhase(
-            phase_number=1,
-            name="Warm-up & Background",
-            description="Getting to know the candidate and their background",
-            max_questions=3
-        ),
-        InterviewPhase(
-            phase_number=2,
-            name="Technical Depth",
-            description="Deep dive into technical skills from the resume",
-            max_questions=6
-        ),
-        InterviewPhase(
-            phase_number=3,
-            name="Problem-Solving Scenario",
-            description="Real-world problem-solving and system design",
-            max_questions=4
-        ),
-        InterviewPhase(
-            phase_number=4,
-            name="Behavioral & Wrap-up",
-            description="Soft skills, behavioral questions, and conclusion",
-            max_questions=3
-        )
-    ]
+    # Phase definitions (defined in services.interview_phases)
+    PHASES = PHASES
+    _PHASE_NAMES = PHASE_NAMES
     
-    def __init__(self, candidate_profile: CandidateProfile, job_description: str):
+    def __init__(
+        self,
+        candidate_profile: CandidateProfile,
+        job_description: str,
+        batcher: Optional[NIMBatcher] = None
+    ):
         """
         Initialize the interview agent
         
         Args:
             candidate_profile: Extracted candidate information
             job_description: Job description text
+            batcher: Shared request batcher; calls go directly to the client if not provided
         """
         self.candidate_profile = candidate_profile
         self.job_description = job_description
-        self.nvidia_client = NVIDIAClient()
+        self.nvidia_client = get_shared_client()
+        self.batcher = batcher
         
         # Create new session
         self.session_id = str(uuid.uuid4())
         self.current_phase = 1
         self.questions_asked_in_phase = 0
         self.total_questions = 0
-        self.conversation_history: List[InterviewMessage] = []
+        self._init_history()
         self.started_at = datetime.now()
+        self.last_activity = self.started_at
         self.status = "active"
+        self.completed_at: Optional[datetime] = None
         
-        # Initialize system prompt
-        self._build_system_prompt()
+        # Static system prompt prefix, rendered on first use
+        self._system_prefix: Optional[str] = None
         
         # Track scores for each phase (used by assessment engine)
         self.phase_scores = {}
         
-        logger.info(f"Initialized interview session {self.session_id} for {candidate_profile.name}")
+        logger.info("Initialized interview session %s for %s", self.session_id, candidate_profile.name)
+    
+    def _init_history(self):
+        """
+        Initialize the conversation history
+        
+        History is stored column-wise (roles, contents, timestamps) rather than
+        as a list of InterviewMessage models; models are only materialized by
+        snapshot(). The prompt window mirrors the last few messages in the
+        wire format sent to the model.
+        """
+        self._roles: List[int] = []
+        self._contents: List[str] = []
+        self._timestamps = array('d')
+        self._prompt_window: deque = deque(maxlen=PROMPT_WINDOW_SIZE)
+    
+    def _append_message(self, role: str, content: str, timestamp: Optional[float] = None):
+        """Record a message in the conversation history"""
+        code = ROLE_CODES[role]
+        self._roles.append(code)
+        self._contents.append(content)
+        self._timestamps.append(time.time() if timestamp is None else timestamp)
+        # Built once per message; every later prompt reuses this dict as-is
+        self._prompt_window.append({"role": ROLES[code], "content": content})
+    
+    @property
+    def history_length(self) -> int:
+        """Number of messages in the conversation history"""
+        return len(self._contents)
+    
+    def snapshot(self) -> List[InterviewMessage]:
+        """Materialize the conversation history as InterviewMessage objects"""
+        # Columns only ever hold values written by _append_message, so the
+        # models are constructed without re-running validation
+        return [
+            InterviewMessage.model_construct(
+                role=ROLES[role],
+                content=content,
+                timestamp=datetime.fromtimestamp(timestamp)
+            )
+            for role, content, timestamp in zip(self._roles, self._contents, self._timestamps)
+        ]
+    
+    @property
+    def system_prefix(self) -> str:
+        """
+        Static part of the system prompt for A.I. Harrison
+        
+        Contains nothing that changes during the interview, so every request
+        in a session starts with a byte-identical prefix that the model
+        provider can serve from its prompt cache.
+        """
+        if self._system_prefix is None:
+            self._system_prefix = self._build_system_prefix()
+        return self._system_prefix
     
-    def _build_system_prompt(self):
-        """Build the system prompt for A.I. Harrison"""
-        self.system_prompt = f"""You are A.I. Harrison, a professional and friendly senior software engineering interviewer conducting a technical interview.
+    def _build_system_prefix(self) -> str:
+        """Build the static system prompt prefix"""
+        return f"""You are A.I. Harrison, a professional and friendly senior software engineering interviewer conducting a technical interview.
 
 Your role:
 - Conduct a thorough but respectful technical interview
@@ -103,10 +170,10 @@ Your role:
 Candidate Information:
 Name: {self.candidate_profile.name}
 Experience: {self.candidate_profile.years_of_experience or 'Not specified'} years
-Skills: {', '.join(self._get_all_skills())}
+Skills: {self._skills_text}
 
 Job Description:
-{self.job_description[:1000]}
+{self._job_description_excerpt}
 
 Interview Structure:
 - Phase 1: Warm-up & Background (get to know the candidate)
@@ -120,20 +187,43 @@ Guidelines:
 - Encourage detailed explanations
 - Be supportive and professional
 - Wrap up gracefully when concluding the interview
-
-Important: You are currently in Phase {self.current_phase} of the interview. Stay focused on the current phase's objectives.
 """
     
-    def _get_all_skills(self) -> List[str]:
+    def _system_messages(self) -> List[Dict[str, str]]:
+        """Static system prefix followed by the short, phase-specific instruction"""
+        return [
+            {"role": "system", "content": self.system_prefix},
+            {"role": "system", "content": PHASE_INSTRUCTIONS[self.current_phase - 1]}
+        ]
+    
+    @cached_property
+    def _all_skills(self) -> tuple[str, ...]:
+        """Candidate's skills, de-duplicated and capped at MAX_PROMPT_SKILLS"""
+        skills = self.candidate_profile.skills
+        if not skills:
+            return ()
+        # The profile does not change during a session, so this is computed once
+        return tuple(dict.fromkeys(itertools.chain(
+            skills.languages,
+            skills.frameworks,
+            skills.tools,
+            skills.databases,
+            skills.cloud_platforms
+        )))[:MAX_PROMPT_SKILLS]
+    
+    @cached_property
+    def _skills_text(self) -> str:
+        """Comma-separated skill list as shown in the system prompt"""
+        return ', '.join(self._all_skills)
+    
+    @cached_property
+    def _job_description_excerpt(self) -> str:
+        """Job description as shown in the system prompt"""
+        return self.job_description[:MAX_PROMPT_JOB_DESCRIPTION_CHARS]
+    
+    def _get_all_skills(self) -> tuple[str, ...]:
         """Get all skills from the candidate profile"""
-        skills = []
-        if self.candidate_profile.skills:
-            skills.extend(self.candidate_profile.skills.languages)
-            skills.extend(self.candidate_profile.skills.frameworks)
-            skills.extend(self.candidate_profile.skills.tools)
-            skills.extend(self.candidate_profile.skills.databases)
-            skills.extend(self.candidate_profile.skills.cloud_platforms)
-        return skills
+        return self._all_skills
     
     async def generate_opening(self) -> str:
         """
@@ -143,10 +233,7 @@ Important: You are currently in Phase {self.current_phase} of the interview. Sta
             Opening message text
         """
         opening_messages = [
-            {
-                "role": "system",
-                "content": self.system_prompt
-            },
+            *self._system_messages(),
             {
                 "role": "assistant",
                 "content": f"""Hello {self.candidate_profile.name}! I'm A.I. Harrison, and I'll be conducting your technical interview today.
@@ -157,18 +244,12 @@ Let's start with a warm-up question: Tell me a bit about yourself and your backg
             }
         ]
         
-        response = await self.nvidia_client.chat_completion(
-            messages=opening_messages,
-            model_type="super",
-            temperature=0.8
-        )
+        response = await self._chat_completion(opening_messages, temperature=0.8)
         
         opening = self.nvidia_client.extract_response_text(response)
         
         # Record the opening message
-        self.conversation_history.append(
-            InterviewMessage(role="assistant", content=opening)
-        )
+        self._append_message("assistant", opening)
         
         return opening
     
@@ -183,57 +264,104 @@ Let's start with a warm-up question: Tell me a bit about yourself and your backg
             Next question or None if interview is complete
         """
         try:
-            # Add candidate message to history
-            self.conversation_history.append(
-                InterviewMessage(role="user", content=candidate_message)
-            )
-            
-            # Check if we should move to the next phase
-            if self._should_advance_phase():
-                if self.current_phase < 4:
-                    self.current_phase += 1
-                    self.questions_asked_in_phase = 0
-                    self._build_system_prompt()  # Update system prompt for new phase
-                    logger.info(f"Advancing to Phase {self.current_phase}")
-                else:
-                    # Interview complete
-                    self.status = "completed"
-                    return await self._generate_closing()
+            if self._begin_turn(candidate_message):
+                return await self._generate_closing()
             
             # Generate next response based on current phase
             next_message = await self._generate_next_message()
+            self._record_question(next_message)
+            return next_message
+        
+        except Exception as e:
+            logger.error("Error processing candidate response: %s", e)
+            raise
+    
+    async def process_candidate_response_stream(self, candidate_message: str) -> AsyncIterator[str]:
+        """
+        Streaming variant of process_candidate_response
+        
+        Args:
+            candidate_message: Candidate's response text
+        
+        Yields:
+            Fragments of the next question (or the closing message) as they are
+            generated. The complete message is added to the history once the
+            stream ends.
+        """
+        try:
+            if self._begin_turn(candidate_message):
+                yield await self._generate_closing()
+                return
             
-            if next_message:
-                self.questions_asked_in_phase += 1
-                self.total_questions += 1
-                self.conversation_history.append(
-                    InterviewMessage(role="assistant", content=next_message)
-                )
+            fragments = []
+            async for fragment in self.nvidia_client.chat_completion_stream(
+                self._prompt_messages(),
+                model_type="super",
+                temperature=0.8
+            ):
+                fragments.append(fragment)
+                yield fragment
             
-            return next_message
+            self._record_question("".join(fragments))
         
         except Exception as e:
-            logger.error(f"Error processing candidate response: {str(e)}")
+            logger.error("Error streaming candidate response: %s", e)
             raise
     
-    async def _generate_next_message(self) -> Optional[str]:
-        """Generate the next message/question for the candidate"""
-        # Build conversation messages
-        messages = [{"role": "system", "content": self.system_prompt}]
+    def _begin_turn(self, candidate_message: str) -> bool:
+        """
+        Record the candidate's message and advance the phase if needed
         
-        # Add recent conversation history (last 10 messages to manage context)
-        recent_history = self.conversation_history[-10:]
-        for msg in recent_history:
-            messages.append({"role": msg.role, "content": msg.content})
+        Returns:
+            True if the interview is now complete
+        """
+        self.last_activity = datetime.now()
+        
+        # Add candidate message to history
+        self._append_message("user", candidate_message)
         
+        # Check if we should move to the next phase
+        if self._should_advance_phase():
+            if self.current_phase < 4:
+                self.current_phase += 1
+                self.questions_asked_in_phase = 0
+                logger.info("Advancing to Phase %s", self.current_phase)
+            else:
+                # Interview complete
+                self.status = "completed"
+                self.completed_at = self.last_activity
+                return True
+        return False
+    
+    def _record_question(self, message: Optional[str]):
+        """Count and record a generated interviewer message"""
+        if message:
+            self.questions_asked_in_phase += 1
+            self.total_questions += 1
+            self._append_message("assistant", message)
+    
+    def _prompt_messages(self) -> List[Dict[str, str]]:
+        """Build conversation messages from the recent history window"""
+        messages = self._system_messages()
+        messages.extend(self._prompt_window)
+        return messages
+    
+    async def _generate_next_message(self) -> Optional[str]:
+        """Generate the next message/question for the candidate"""
         # Get response from NVIDIA model
-        response = await self.nvidia_client.chat_completion(
+        response = await self._chat_completion(self._prompt_messages(), temperature=0.8)
+        
+        return self.nvidia_client.extract_response_text(response)
+    
+    async def _chat_completion(self, messages: List[Dict[str, Any]], temperature: float) -> Dict[str, Any]:
+        """Send a chat completion to the super model, through the batcher when available"""
+        if self.batcher is not None:
+            return await self.batcher.submit(messages, model_type="super", temperature=temperature)
+        return await self.nvidia_client.chat_completion(
             messages=messages,
             model_type="super",
-            temperature=0.8
+            temperature=temperature
         )
-        
-        return self.nvidia_client.extract_response_text(response)
     
     def _should_advance_phase(self) -> bool:
         """Determine if we should advance to the next phase"""
@@ -246,27 +374,91 @@ Let's start with a warm-up question: Tell me a bit about yourself and your backg
 
 The interview process is now complete. We'll review your responses and be in touch soon. Do you have any questions for me about the position or the team?"""
         
-        self.conversation_history.append(
-            InterviewMessage(role="assistant", content=closing)
-        )
+        self._append_message("assistant", closing)
         
         return closing
     
     def get_interview_state(self) -> InterviewState:
         """Get the current state of the interview"""
-        current_phase_def = self.PHASES[self.current_phase - 1]
-        
-        return InterviewState(
+        # Every field is produced by the agent itself, so validation is skipped
+        return InterviewState.model_construct(
             session_id=self.session_id,
             candidate_profile=self.candidate_profile,
             job_description=self.job_description,
             current_phase=self.current_phase,
             total_questions=self.total_questions,
-            conversation_history=self.conversation_history,
+            conversation_history=self.snapshot(),
             started_at=self.started_at,
             status=self.status
         )
     
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the agent's session state to a JSON-compatible dictionary
+
+        Returns:
+            Dictionary that can be passed to from_dict() to restore the agent
+        """
+        return {
+            "session_id": self.session_id,
+            "candidate_profile": self.candidate_profile.model_dump(mode="json"),
+            "job_description": self.job_description,
+            "current_phase": self.current_phase,
+            "questions_asked_in_phase": self.questions_asked_in_phase,
+            "total_questions": self.total_questions,
+            "conversation_history": {
+                "roles": [ROLES[role] for role in self._roles],
+                "contents": self._contents,
+                "timestamps": self._timestamps.tolist()
+            },
+            "started_at": self.started_at.isoformat(),
+            "last_activity": self.last_activity.isoformat(),
+            "status": self.status,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "phase_scores": self.phase_scores
+        }
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: Dict[str, Any],
+        batcher: Optional[NIMBatcher] = None
+    ) -> "InterviewAgent":
+        """
+        Restore an agent from a dictionary produced by to_dict()
+
+        Args:
+            data: Serialized session state
+            batcher: Shared request batcher for NVIDIA API calls
+
+        Returns:
+            InterviewAgent with the restored session state
+        """
+        agent = cls.__new__(cls)
+        agent.candidate_profile = CandidateProfile.model_validate(data["candidate_profile"])
+        agent.job_description = data["job_description"]
+        agent.nvidia_client = get_shared_client()
+        agent.batcher = batcher
+
+        agent.session_id = data["session_id"]
+        agent.current_phase = data["current_phase"]
+        agent.questions_asked_in_phase = data["questions_asked_in_phase"]
+        agent.total_questions = data["total_questions"]
+        history = data["conversation_history"]
+        agent._init_history()
+        for role, content, timestamp in zip(
+            history["roles"], history["contents"], history["timestamps"]
+        ):
+            agent._append_message(role, content, timestamp)
+        agent.started_at = datetime.fromisoformat(data["started_at"])
+        agent.last_activity = datetime.fromisoformat(data["last_activity"])
+        agent.status = data["status"]
+        completed_at = data.get("completed_at")
+        agent.completed_at = datetime.fromisoformat(completed_at) if completed_at else None
+        agent.phase_scores = data.get("phase_scores", {})
+        agent._system_prefix = None
+        return agent
+
     async def close(self):
         """Clean up resources"""
         await self.nvidia_client.close()
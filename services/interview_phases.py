@@ -0,0 +1,41 @@
+"""
+Interview Phase Definitions
+
+This module defines the four phases of the interview. It has no service
+dependencies so both the interview agent and the assessment engine can
+import it, and phase-derived strings can be built at import time.
+"""
+
+from models.schemas import InterviewPhase
+
+
+# Phase definitions
+PHASES = [
+    InterviewPhase(
+        phase_number=1,
+        name="Warm-up & Background",
+        description="Getting to know the candidate and their background",
+        max_questions=3
+    ),
+    InterviewPhase(
+        phase_number=2,
+        name="Technical Depth",
+        description="Deep dive into technical skills from the resume",
+        max_questions=6
+    ),
+    InterviewPhase(
+        phase_number=3,
+        name="Problem-Solving Scenario",
+        description="Real-world problem-solving and system design",
+        max_questions=4
+    ),
+    InterviewPhase(
+        phase_number=4,
+        name="Behavioral & Wrap-up",
+        description="Soft skills, behavioral questions, and conclusion",
+        max_questions=3
+    )
+]
+
+# Phase names indexed by phase_number - 1
+PHASE_NAMES: tuple[str, ...] = tuple(p.name for p in PHASES)
@@ -0,0 +1,74 @@
+"""
+LLM Response Cache
+
+This module provides an on-disk cache for NVIDIA NIM chat completion
+responses. Identical low-temperature requests (e.g. re-generating the
+assessment for the same transcript during development or retries) are
+answered from disk instead of repeating the full generation.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+from diskcache import Cache
+
+
+logger = logging.getLogger(__name__)
+
+
+# Entries expire after 14 days; the cache is capped at 100 MB on disk
+CACHE_TTL_SECONDS = 14 * 24 * 60 * 60
+CACHE_SIZE_LIMIT = 100 * 1024 * 1024
+
+# Sampling above this temperature is meant to vary, so it is never cached
+MAX_CACHEABLE_TEMPERATURE = 0.5
+
+
+class LLMResponseCache:
+    """Disk-backed cache of chat completion responses keyed by request payload"""
+
+    def __init__(self, directory: str):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Cache directory (created if missing, ~ is expanded)
+        """
+        self.cache = Cache(os.path.expanduser(directory), size_limit=CACHE_SIZE_LIMIT)
+
+    @staticmethod
+    def key(payload: Dict[str, Any]) -> str:
+        """SHA-256 of the canonical JSON form of a request payload"""
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def is_cacheable(payload: Dict[str, Any]) -> bool:
+        """Whether responses to this payload are deterministic enough to cache"""
+        return payload["temperature"] <= MAX_CACHEABLE_TEMPERATURE
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response (disk I/O runs in a worker thread)"""
+        return await asyncio.to_thread(self.cache.get, key)
+
+    async def set(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a successful response"""
+        await asyncio.to_thread(self.cache.set, key, response, expire=CACHE_TTL_SECONDS)
+
+    def close(self):
+        """Close the underlying cache database"""
+        self.cache.close()
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache(directory: str) -> LLMResponseCache:
+    """Get the process-wide response cache, opening it on first use"""
+    global _llm_cache
+    if _llm_cache is None:
+        logger.info("LLM response cache enabled at %s", directory)
+        _llm_cache = LLMResponseCache(directory)
+    return _llm_cache
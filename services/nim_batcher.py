@@ -0,0 +1,159 @@
+"""
+NVIDIA NIM Request Batcher
+
+This module coalesces chat completion requests that arrive together. A
+request that finds nothing else queued is sent straight away; only when
+others are already waiting does the batcher hold for a short window to let
+the burst fill a batch. The OpenAI-compatible NIM chat endpoint accepts one conversation per
+request, so a batch is dispatched as concurrent calls over the shared HTTP/2
+connection pool, and byte-identical payloads in the same batch are collapsed
+into a single upstream call whose response is shared by every waiter.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import orjson
+from services.nvidia_client import NVIDIAClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class NIMBatcher:
+    """Micro-batcher for NVIDIA NIM chat completion requests"""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], NVIDIAClient],
+        max_batch: int = 8,
+        max_wait_ms: float = 15
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            client_factory: Builds the NVIDIAClient used to dispatch batches.
+                Called lazily on the first batch so configuration errors
+                surface on the request that triggered them.
+            max_batch: Maximum number of requests drained into one batch
+            max_wait_ms: Maximum time to wait for a batch to fill once a
+                second request is queued
+        """
+        self.client_factory = client_factory
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._nvidia_client: Optional[NVIDIAClient] = None
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._dispatches: Set[asyncio.Task] = set()
+
+    def start(self):
+        """Start the background task that drains the queue"""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Stop the background task and wait for in-flight batches"""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        await asyncio.gather(*self._dispatches, return_exceptions=True)
+        if self._nvidia_client is not None:
+            await self._nvidia_client.close()
+
+    async def submit(
+        self,
+        messages: List[Dict[str, Any]],
+        model_type: str = "super",
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Queue a chat completion request and wait for its response
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model_type: Either 'super' or 'vl'
+            temperature: Sampling temperature (uses config default if not provided)
+            max_tokens: Maximum tokens to generate (uses config default if not provided)
+            **kwargs: Additional parameters to pass to the API
+
+        Returns:
+            API response as dictionary
+        """
+        future = asyncio.get_running_loop().create_future()
+        request = {
+            "messages": messages,
+            "model_type": model_type,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs
+        }
+        await self._queue.put((request, future))
+        return await future
+
+    async def _run(self):
+        """Drain the queue into batches of up to max_batch requests"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            # Let requests submitted in the same tick (e.g. one per page) join
+            await asyncio.sleep(0)
+            if self._queue.empty():
+                # An isolated request gains nothing from waiting for company
+                self._start_dispatch(batch)
+                continue
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self._start_dispatch(batch)
+
+    def _start_dispatch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Dispatch a batch without blocking the next batch from forming"""
+        task = asyncio.create_task(self._dispatch(batch))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Send one batch upstream and resolve each waiter's future"""
+        # Group identical requests so each distinct payload is sent once
+        groups: Dict[bytes, List[asyncio.Future]] = {}
+        requests: Dict[bytes, Dict[str, Any]] = {}
+        for request, future in batch:
+            # Payloads can carry a base64 image, so keys are built with orjson
+            key = orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+            groups.setdefault(key, []).append(future)
+            requests[key] = request
+
+        if len(groups) < len(batch):
+            logger.info("Coalesced %d requests into %d NIM calls", len(batch), len(groups))
+
+        try:
+            if self._nvidia_client is None:
+                self._nvidia_client = self.client_factory()
+            results = await asyncio.gather(
+                *[self._nvidia_client.chat_completion(**requests[key]) for key in groups],
+                return_exceptions=True
+            )
+        except Exception as e:
+            results = [e] * len(groups)
+
+        for futures, result in zip(groups.values(), results):
+            for future in futures:
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
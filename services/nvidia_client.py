@@ -5,32 +5,115 @@ This module provides a wrapper around the NVIDIA NIM API for interacting
 with Nemotron models (both the main interview agent and vision-language model).
 """
 
+import asyncio
+import random
 import httpx
 import json
 import base64
-from typing import Dict, List, Optional, Any, Union
-from config.nvidia_config import get_nvidia_config
+import orjson
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
+from config.nvidia_config import NVIDIAConfig, get_nvidia_config
+from services.llm_cache import LLMResponseCache, get_llm_cache
+
+
+# Generation budget for structured extraction from resumes
+EXTRACTION_MAX_TOKENS = 4096
+
+# Upper bound on the wait between retries of a failed request
+MAX_BACKOFF_SECONDS = 30
+
+# OpenAI-compatible JSON mode: the model may only emit a single JSON object
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+
+def create_http_client(config: Optional[NVIDIAConfig] = None) -> httpx.AsyncClient:
+    """
+    Create an HTTP client for the NVIDIA NIM API
+    
+    The client keeps a pool of HTTP/2 connections alive so it can be shared
+    by every service in the process instead of handshaking per request.
+    
+    Args:
+        config: NVIDIA configuration (uses the global config if not provided)
+    
+    Returns:
+        Configured httpx.AsyncClient
+    """
+    config = config or get_nvidia_config()
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=config.timeout,
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=50,
+            keepalive_expiry=300
+        ),
+        headers={
+            "Authorization": f"Bearer {config.api_key}",
+            "Content-Type": "application/json"
+        }
+    )
+
+
+def max_request_seconds(config: Optional[NVIDIAConfig] = None) -> float:
+    """
+    Worst-case duration of one chat_completion call: every attempt running
+    into the HTTP timeout, plus the longest possible backoff between them
+    """
+    config = config or get_nvidia_config()
+    backoff = sum(min(MAX_BACKOFF_SECONDS, 2 ** attempt + 1) for attempt in range(config.max_retries - 1))
+    return config.max_retries * config.timeout + backoff
+
+
+# Process-wide HTTP client used by every NVIDIAClient not given its own
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """Get the process-wide NVIDIA HTTP client, creating it on first use"""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = create_http_client()
+    return _shared_client
+
+
+async def close_shared_http_client():
+    """Close the process-wide NVIDIA HTTP client"""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
 
 
 class NVIDIAClient:
     """Client for interacting with NVIDIA NIM API"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the client
+        
+        Args:
+            http_client: HTTP client to use. Defaults to the process-wide
+                shared client, so instances never open their own pool.
+        """
         self.config = get_nvidia_config()
         self.config.validate_config()
         
         # Setup HTTP client
-        self.client = httpx.AsyncClient(
-            timeout=self.config.timeout,
-            headers={
-                "Authorization": f"Bearer {self.config.api_key}",
-                "Content-Type": "application/json"
-            }
-        )
+        self.client = http_client or get_shared_http_client()
+        
+        # Optional on-disk cache of deterministic responses
+        self.response_cache: Optional[LLMResponseCache] = None
+        if self.config.llm_cache_enabled:
+            self.response_cache = get_llm_cache(self.config.llm_cache_dir)
     
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+        """
+        Release the client
+        
+        The HTTP client is shared, so it is left open; it is closed by
+        shutdown_client() (or by whoever created an injected one).
+        """
     
     async def chat_completion(
         self,
@@ -53,6 +136,100 @@ class NVIDIAClient:
         Returns:
             API response as dictionary
         """
+        endpoint, payload = self._build_request(messages, model_type, temperature, max_tokens, **kwargs)
+        
+        cache_key = None
+        if self.response_cache is not None and LLMResponseCache.is_cacheable(payload):
+            cache_key = LLMResponseCache.key(payload)
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # Make API request, retrying rate limits, server errors and network failures
+        for attempt in range(self.config.max_retries):
+            try:
+                # Encoded with orjson rather than httpx's stdlib json encoder
+                response = await self.client.post(endpoint, content=orjson.dumps(payload))
+                response.raise_for_status()
+                result = orjson.loads(response.content)
+                if cache_key is not None:
+                    await self.response_cache.set(cache_key, result)
+                return result
+            
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                if status_code < 500 and status_code != 429:
+                    # Other client errors will fail the same way on every attempt
+                    raise Exception(f"NVIDIA API error: {e}")
+                error = e
+            
+            except httpx.TransportError as e:
+                # Timeouts, dropped connections, protocol errors
+                error = e
+            
+            except Exception as e:
+                raise Exception(f"Error calling NVIDIA NIM API: {str(e)}")
+            
+            if attempt == self.config.max_retries - 1:
+                raise Exception(
+                    f"NVIDIA API error after {self.config.max_retries} attempts: "
+                    f"{type(error).__name__}: {error}"
+                )
+            # Wait before retrying (jittered exponential backoff)
+            await asyncio.sleep(min(MAX_BACKOFF_SECONDS, 2 ** attempt + random.random()))
+    
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model_type: str = "super",
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from NVIDIA NIM API
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model_type: Either 'super' (Nemotron-super-49b) or 'vl' (Nemotron-nano-vl)
+            temperature: Sampling temperature (uses config default if not provided)
+            max_tokens: Maximum tokens to generate (uses config default if not provided)
+            **kwargs: Additional parameters to pass to the API
+        
+        Yields:
+            Generated text fragments as they arrive
+        """
+        endpoint, payload = self._build_request(messages, model_type, temperature, max_tokens, **kwargs)
+        payload["stream"] = True
+        
+        try:
+            async with self.client.stream("POST", endpoint, content=orjson.dumps(payload)) as response:
+                response.raise_for_status()
+                # Server-sent events: one "data: {...}" line per chunk, then "data: [DONE]"
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[len("data: "):]
+                    if data == "[DONE]":
+                        break
+                    chunk = orjson.loads(data)
+                    if not chunk.get("choices"):
+                        continue
+                    content = chunk["choices"][0].get("delta", {}).get("content")
+                    if content:
+                        yield content
+        except httpx.HTTPError as e:
+            raise Exception(f"Error streaming from NVIDIA NIM API: {str(e)}")
+    
+    def _build_request(
+        self,
+        messages: List[Dict[str, Any]],
+        model_type: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Select the endpoint for model_type and build the request payload"""
         # Select endpoint and model based on type
         if model_type == "super":
             endpoint = self.config.nemotron_super_endpoint
@@ -63,6 +240,10 @@ class NVIDIAClient:
         else:
             raise ValueError(f"Invalid model_type: {model_type}. Use 'super' or 'vl'")
         
+        # Hint that the static leading system prompt can be cached
+        if self.config.prompt_cache_hint and messages and messages[0]["role"] == "system":
+            messages = [{**messages[0], "cache_control": {"type": "ephemeral"}}, *messages[1:]]
+        
         # Prepare request payload
         payload = {
             "model": model,
@@ -72,42 +253,34 @@ class NVIDIAClient:
             "top_p": self.config.top_p,
             **kwargs
         }
-        
-        # Make API request with retries
-        for attempt in range(self.config.max_retries):
-            try:
-                response = await self.client.post(endpoint, json=payload)
-                response.raise_for_status()
-                return response.json()
-            
-            except httpx.HTTPStatusError as e:
-                if attempt == self.config.max_retries - 1:
-                    raise Exception(f"NVIDIA API error after {self.config.max_retries} attempts: {e}")
-                # Wait before retrying (exponential backoff)
-                await asyncio.sleep(2 ** attempt)
-            
-            except Exception as e:
-                raise Exception(f"Error calling NVIDIA NIM API: {str(e)}")
+        return endpoint, payload
     
-    async def analyze_resume_image(
-        self,
-        image_base64: str,
+    def extraction_params(self) -> Dict[str, Any]:
+        """Extra request parameters for calls that must return a JSON object"""
+        return {"response_format": JSON_RESPONSE_FORMAT} if self.config.json_mode else {}
+    
+    @staticmethod
+    def build_image_messages(
+        image_bytes: bytes,
         prompt: str,
         image_format: str = "png"
-    ) -> Dict[str, Any]:
+    ) -> List[Dict[str, Any]]:
         """
-        Analyze a resume image using Nemotron-Nano-VL model
+        Build the multimodal chat messages for a single image prompt
         
         Args:
-            image_base64: Base64 encoded image data
+            image_bytes: Encoded image data (e.g. PNG file content)
             prompt: Text prompt for the vision model
             image_format: Image format (png, jpg, jpeg)
         
         Returns:
-            API response with extracted resume data
+            Messages suitable for a 'vl' chat completion
         """
+        # Base64-encode once; the data URL is built with a single concatenation
+        image_url = "data:image/" + image_format + ";base64," + base64.b64encode(image_bytes).decode("ascii")
+        
         # Construct multimodal message
-        messages = [
+        return [
             {
                 "role": "user",
                 "content": [
@@ -118,14 +291,70 @@ class NVIDIAClient:
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:image/{image_format};base64,{image_base64}"
+                            "url": image_url
                         }
                     }
                 ]
             }
         ]
+    
+    async def analyze_resume_image(
+        self,
+        image_bytes: bytes,
+        prompt: str,
+        image_format: str = "png"
+    ) -> Dict[str, Any]:
+        """
+        Analyze a resume image using Nemotron-Nano-VL model
+        
+        Args:
+            image_bytes: Encoded image data (e.g. PNG file content)
+            prompt: Text prompt for the vision model
+            image_format: Image format (png, jpg, jpeg)
+        
+        Returns:
+            API response with extracted resume data
+        """
+        messages = self.build_image_messages(image_bytes, prompt, image_format)
+        return await self.chat_completion(
+            messages,
+            model_type="vl",
+            max_tokens=EXTRACTION_MAX_TOKENS,
+            **self.extraction_params()
+        )
+    
+    @staticmethod
+    def build_text_messages(text: str, prompt: str) -> List[Dict[str, Any]]:
+        """
+        Build the chat messages for a prompt applied to extracted document text
+        
+        Args:
+            text: Plain text extracted from the document
+            prompt: Instructions for the model
+        
+        Returns:
+            Messages suitable for a 'super' chat completion
+        """
+        return [{"role": "user", "content": prompt + "\n\nResume text:\n" + text}]
+    
+    async def analyze_resume_text(self, text: str, prompt: str) -> Dict[str, Any]:
+        """
+        Analyze the extracted text of a resume using the Nemotron-super model
+        
+        Args:
+            text: Plain text extracted from the resume
+            prompt: Text prompt describing the extraction
         
-        return await self.chat_completion(messages, model_type="vl", max_tokens=4096)
+        Returns:
+            API response with extracted resume data
+        """
+        messages = self.build_text_messages(text, prompt)
+        return await self.chat_completion(
+            messages,
+            model_type="super",
+            max_tokens=EXTRACTION_MAX_TOKENS,
+            **self.extraction_params()
+        )
     
     async def generate_interview_response(
         self,
@@ -173,6 +402,20 @@ class NVIDIAClient:
             raise Exception(f"Failed to extract response text: {str(e)}")
 
 
-# Import asyncio for sleep function
-import asyncio
+# Process-wide NVIDIAClient shared by every service
+_shared_nvidia_client: Optional[NVIDIAClient] = None
+
+
+def get_shared_client() -> NVIDIAClient:
+    """Get the process-wide NVIDIAClient, validating configuration on first use"""
+    global _shared_nvidia_client
+    if _shared_nvidia_client is None:
+        _shared_nvidia_client = NVIDIAClient()
+    return _shared_nvidia_client
+
 
+async def shutdown_client():
+    """Release the process-wide client and close its connection pool"""
+    global _shared_nvidia_client
+    _shared_nvidia_client = None
+    await close_shared_http_client()
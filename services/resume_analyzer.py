@@ -1,31 +1,96 @@
 """
 Resume Analysis Service
 
-This module handles PDF resume processing and analysis using the Nemotron-Nano-12B-v2-VL
-vision-language model. It converts PDFs to images and extracts structured candidate
-information.
+This module handles PDF resume processing and analysis. Text-native PDFs are
+parsed from their extracted text by the Nemotron-super model; scanned PDFs are
+converted to images and analyzed by the Nemotron-Nano-12B-v2-VL vision-language
+model. Both paths extract the same structured candidate information.
 """
 
-import base64
-import io
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional
-from PIL import Image
-import pdfplumber
-from pdf2image import convert_from_bytes
-from services.nvidia_client import NVIDIAClient
-from models.schemas import CandidateProfile, ResumeSkills, WorkExperience, Education, Project
+import os
+import tempfile
+from concurrent.futures import Executor
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, List, Optional, Tuple, Union
+import fitz
+import orjson
+from services.nim_batcher import NIMBatcher
+from services.nvidia_client import EXTRACTION_MAX_TOKENS, get_shared_client
+from models.schemas import CandidateProfile
+from utils.model_output import strip_json_fence
+
+try:
+    import json_repair
+except ImportError:  # Optional: malformed JSON goes straight to the retry
+    json_repair = None
 
 
 logger = logging.getLogger(__name__)
 
 
-class ResumeAnalyzer:
-    """Service for analyzing resumes using vision-language AI"""
+# Only the leading pages of a scanned resume are rendered and sent to the
+# vision model, one concurrent request per page
+MAX_ANALYZED_PAGES = 3
+
+# PDFs with at least this many non-whitespace characters of extractable text
+# skip rendering and the vision model; fewer usually means a scanned document
+MIN_TEXT_CHARS = 200
+
+# Extracted text sent to the model is cut at this length (roughly 6k tokens),
+# which covers any real resume and keeps large PDFs within the model's context
+MAX_TEXT_CHARS = 24000
+
+# Values for required fields the model left out of (or set to null in) an extracted entry
+EXPERIENCE_DEFAULTS = {"company": "", "position": "", "duration": "", "description": ""}
+EDUCATION_DEFAULTS = {"institution": "", "degree": ""}
+PROJECT_DEFAULTS = {"name": "", "description": ""}
+
+# Fields merged across pages: scalars keep the first page's value, lists concatenate
+PROFILE_SCALAR_FIELDS = ("name", "email", "phone", "summary", "years_of_experience")
+PROFILE_LIST_FIELDS = ("experience", "education", "projects")
+
+# Pages render at BASE_DPI, or DENSE_TEXT_DPI when most text is set below
+# SMALL_TEXT_PT. The longest image edge is capped at MAX_IMAGE_EDGE pixels,
+# since image size drives both upload bytes and the VLM's vision-token count
+BASE_DPI = 150
+DENSE_TEXT_DPI = 200
+SMALL_TEXT_PT = 9.0
+MAX_IMAGE_EDGE = 2048
+
+# Rendered pages are sent as JPEG, several times smaller than PNG at this
+# quality while keeping text legible to the vision model
+IMAGE_FORMAT = "jpeg"
+JPEG_QUALITY = 85
+
+
+class DamagedPDFError(ValueError):
+    """Raised when an uploaded file cannot be opened as a PDF"""
+
+
+def _non_null(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop null fields so model defaults apply to them"""
+    return {key: value for key, value in entry.items() if value is not None}
+
+
+def _render_dpi(page: "fitz.Page") -> int:
+    """Choose the render resolution for a page from its median font size"""
+    sizes = sorted(
+        span["size"]
+        for block in page.get_text("dict")["blocks"]
+        for line in block.get("lines", ())
+        for span in line["spans"]
+        if span["text"].strip()
+    )
+    dpi = DENSE_TEXT_DPI if sizes and sizes[len(sizes) // 2] < SMALL_TEXT_PT else BASE_DPI
     
-    def __init__(self):
-        self.nvidia_client = NVIDIAClient()
-        self.resume_analysis_prompt = """You are an expert resume parser. Analyze this resume and extract structured information in JSON format.
+    longest_edge_pt = max(page.rect.width, page.rect.height)
+    return max(1, min(dpi, int(MAX_IMAGE_EDGE * 72 / longest_edge_pt)))
+
+
+# Fixed extraction instructions, sent ahead of the resume in every extraction request
+RESUME_ANALYSIS_PROMPT = """You are an expert resume parser. Analyze this resume and extract structured information in JSON format.
 
 Return ONLY a JSON object with the following structure:
 {
@@ -68,6 +133,60 @@ Return ONLY a JSON object with the following structure:
 
 Be thorough and extract all relevant technical information. If a field is not available, use null or an empty list.
 Focus on technical skills, programming languages, frameworks, and experience relevant to software engineering."""
+
+# Sent once after a response that could not be parsed or repaired
+STRICT_RESUME_ANALYSIS_PROMPT = RESUME_ANALYSIS_PROMPT + """
+
+Respond with the JSON object only: no prose, no markdown code fences, no comments."""
+
+
+async def spool_to_tempfile(chunks: AsyncIterator[bytes]) -> Tuple[str, str, int]:
+    """
+    Write a stream of PDF chunks to a temporary file
+    
+    Args:
+        chunks: Async iterator yielding consecutive pieces of the PDF file
+    
+    Returns:
+        Tuple of (file path, BLAKE2b-128 hex digest of the content, size in bytes).
+        The caller is responsible for deleting the file.
+    """
+    # BLAKE2b hashes faster than SHA-256 and 128 bits is ample for a cache key
+    digest = hashlib.blake2b(digest_size=16)
+    size = 0
+    pdf_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+    try:
+        with pdf_file:
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                pdf_file.write(chunk)
+    except BaseException:
+        os.unlink(pdf_file.name)
+        raise
+    return pdf_file.name, digest.hexdigest(), size
+
+
+class ResumeAnalyzer:
+    """Service for analyzing resumes using vision-language AI"""
+    
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        batcher: Optional[NIMBatcher] = None
+    ):
+        """
+        Initialize the analyzer
+        
+        Args:
+            executor: Executor for CPU-bound PDF rendering (e.g. a process
+                pool). Uses the event loop's default executor if not provided.
+            batcher: Shared request batcher; calls go directly to the client if not provided
+        """
+        self.nvidia_client = get_shared_client()
+        self.executor = executor
+        self.batcher = batcher
+        self.resume_analysis_prompt = RESUME_ANALYSIS_PROMPT
     
     async def analyze_pdf(self, pdf_bytes: bytes) -> CandidateProfile:
         """
@@ -80,73 +199,281 @@ Focus on technical skills, programming languages, frameworks, and experience rel
             CandidateProfile object with extracted information
         """
         try:
-            # Convert PDF to images
-            logger.info("Converting PDF to images...")
-            images = convert_from_bytes(pdf_bytes, dpi=200, fmt='PNG')
-            
-            if not images:
-                raise ValueError("Failed to convert PDF to images")
-            
-            # Analyze the first page (you could extend to multiple pages)
-            logger.info(f"Analyzing {len(images)} page(s) of resume...")
-            candidate_data = await self._analyze_resume_image(images[0])
-            
-            # Parse and validate the extracted data
-            profile = self._parse_candidate_data(candidate_data)
-            logger.info(f"Successfully extracted profile for: {profile.name}")
+            return await self._analyze(pdf_bytes)
             
-            return profile
+        except Exception as e:
+            logger.error("Error analyzing resume: %s", e)
+            raise
+    
+    async def analyze_pdf_file(self, pdf_path: str) -> CandidateProfile:
+        """
+        Analyze a PDF resume stored on disk
+        
+        Args:
+            pdf_path: Path to the PDF file
+        
+        Returns:
+            CandidateProfile object with extracted information
+        """
+        try:
+            return await self._analyze(pdf_path)
             
         except Exception as e:
-            logger.error(f"Error analyzing resume: {str(e)}")
+            logger.error("Error analyzing resume: %s", e)
             raise
     
-    async def _analyze_resume_image(self, image: Image.Image) -> Dict[str, Any]:
+    async def _analyze(self, pdf: Union[str, bytes]) -> CandidateProfile:
+        """Analyze the extracted text when there is enough of it, else the rendered pages"""
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(self.executor, ResumeAnalyzer._extract_text, pdf)
+        if len("".join(text.split())) < MIN_TEXT_CHARS:
+            images = await self._render_pages(pdf)
+            return await self._vl_call(images)
+        
+        logger.info("Analyzing extracted resume text (%d chars)...", len(text))
+        candidate_data = await self._analyze_resume_text(text)
+        
+        profile = self._parse_candidate_data(candidate_data)
+        logger.info("Successfully extracted profile for: %s", profile.name)
+        
+        return profile
+    
+    @staticmethod
+    def _open_pdf(pdf: Union[str, bytes]) -> "fitz.Document":
+        """
+        Open a PDF from a path or its binary content
+        
+        Raises:
+            DamagedPDFError: If the content is not a readable PDF
+        """
+        try:
+            if isinstance(pdf, bytes):
+                return fitz.open(stream=pdf, filetype="pdf")
+            return fitz.open(pdf, filetype="pdf")
+        except fitz.FileDataError:
+            # PyMuPDF's message includes the (temporary) file path; keep it out
+            raise DamagedPDFError("The file appears to be damaged") from None
+    
+    @staticmethod
+    def _extract_text(pdf: Union[str, bytes]) -> str:
+        """
+        Extract the embedded text of a PDF, up to MAX_TEXT_CHARS
+        
+        Args:
+            pdf: Path to the PDF file, or its binary content
+        
+        Returns:
+            Text of the leading pages, separated by newlines (empty for scanned pages)
+        """
+        pages = []
+        length = 0
+        with ResumeAnalyzer._open_pdf(pdf) as document:
+            for page in document:
+                if length >= MAX_TEXT_CHARS:
+                    break
+                text = page.get_text()
+                pages.append(text)
+                length += len(text) + 1
+        return "\n".join(pages)[:MAX_TEXT_CHARS]
+    
+    async def _render_pages(self, pdf: Union[str, bytes]) -> List[bytes]:
+        """Render the analyzed PDF pages off the event loop, in the configured executor"""
+        logger.info("Converting PDF to images...")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, ResumeAnalyzer._pdf_to_images, pdf, MAX_ANALYZED_PAGES
+        )
+    
+    @staticmethod
+    def _pdf_to_images(pdf: Union[str, bytes], max_pages: Optional[int] = None) -> List[bytes]:
+        """
+        Render the pages of a PDF to JPEG bytes
+        
+        Pure CPU work with picklable inputs and outputs, so it can run in a
+        worker process.
+        
+        Args:
+            pdf: Path to the PDF file, or its binary content
+            max_pages: Render at most this many leading pages (all if None)
+        
+        Returns:
+            JPEG-encoded image of each rendered page
+        """
+        # PyMuPDF renders in-process, without spawning pdftoppm per document
+        with ResumeAnalyzer._open_pdf(pdf) as document:
+            page_count = document.page_count if max_pages is None else min(max_pages, document.page_count)
+            images = []
+            for index in range(page_count):
+                page = document[index]
+                pixmap = page.get_pixmap(dpi=_render_dpi(page), alpha=False)
+                images.append(pixmap.tobytes(IMAGE_FORMAT, jpg_quality=JPEG_QUALITY))
+            return images
+    
+    async def _vl_call(self, images: List[bytes]) -> CandidateProfile:
+        """
+        Extract a candidate profile from rendered resume pages
+        
+        Args:
+            images: JPEG-encoded PDF pages
+        
+        Returns:
+            CandidateProfile object with extracted information
+        """
+        if not images:
+            raise ValueError("Failed to convert PDF to images")
+        
+        # Analyze every page concurrently, then combine what each page contributed
+        logger.info("Analyzing %d page(s) of resume...", len(images))
+        page_data = await asyncio.gather(*(self._analyze_resume_image(image) for image in images))
+        candidate_data = page_data[0] if len(page_data) == 1 else self._merge_candidate_data(page_data)
+        
+        # Parse and validate the extracted data
+        profile = self._parse_candidate_data(candidate_data)
+        logger.info("Successfully extracted profile for: %s", profile.name)
+        
+        return profile
+    
+    async def _analyze_resume_image(self, image_bytes: bytes) -> Dict[str, Any]:
         """
         Analyze a single resume image using the vision-language model
         
         Args:
-            image: PIL Image object
+            image_bytes: JPEG-encoded page image
         
         Returns:
             Extracted candidate data as dictionary
         """
-        # Convert image to base64
-        buffer = io.BytesIO()
-        image.save(buffer, format='PNG')
-        image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+        async def request(prompt: str) -> Dict[str, Any]:
+            # Call NVIDIA VL model, coalescing with concurrent uploads when batched
+            if self.batcher is not None:
+                messages = self.nvidia_client.build_image_messages(
+                    image_bytes, prompt, image_format=IMAGE_FORMAT
+                )
+                return await self.batcher.submit(
+                    messages,
+                    model_type="vl",
+                    max_tokens=EXTRACTION_MAX_TOKENS,
+                    **self.nvidia_client.extraction_params()
+                )
+            return await self.nvidia_client.analyze_resume_image(
+                image_bytes=image_bytes,
+                prompt=prompt,
+                image_format=IMAGE_FORMAT
+            )
         
-        # Call NVIDIA VL model
-        response = await self.nvidia_client.analyze_resume_image(
-            image_base64=image_base64,
-            prompt=self.resume_analysis_prompt,
-            image_format="png"
-        )
+        return await self._extract_candidate_data(request)
+    
+    async def _analyze_resume_text(self, text: str) -> Dict[str, Any]:
+        """
+        Analyze extracted resume text using the Nemotron-super model
+        
+        Args:
+            text: Plain text extracted from the PDF
+        
+        Returns:
+            Extracted candidate data as dictionary
+        """
+        async def request(prompt: str) -> Dict[str, Any]:
+            if self.batcher is not None:
+                messages = self.nvidia_client.build_text_messages(text, prompt)
+                return await self.batcher.submit(
+                    messages,
+                    model_type="super",
+                    max_tokens=EXTRACTION_MAX_TOKENS,
+                    **self.nvidia_client.extraction_params()
+                )
+            return await self.nvidia_client.analyze_resume_text(text, prompt)
+        
+        return await self._extract_candidate_data(request)
+    
+    async def _extract_candidate_data(
+        self,
+        request: Callable[[str], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Run an extraction request, retrying once with a JSON-only prompt
+        
+        Args:
+            request: Sends the extraction with the given prompt and returns the API response
+        
+        Returns:
+            Extracted candidate data as dictionary
+        """
+        candidate_data = self._parse_response_json(await request(self.resume_analysis_prompt))
+        if candidate_data is None:
+            logger.warning("Retrying resume extraction with a JSON-only prompt")
+            candidate_data = self._parse_response_json(await request(STRICT_RESUME_ANALYSIS_PROMPT))
         
+        if candidate_data is None:
+            raise ValueError("Failed to parse structured data from AI response")
+        return candidate_data
+    
+    def _parse_response_json(self, response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Extract the candidate data JSON object from a chat completion response
+        
+        Returns:
+            Parsed candidate data, or None if the response holds no usable JSON
+        """
         # Extract the JSON response
         response_text = self.nvidia_client.extract_response_text(response)
         
-        # Try to parse JSON from the response
-        import json
+        # Without JSON mode the model sometimes wraps JSON in markdown code blocks
+        response_text = strip_json_fence(response_text)
+        
         try:
-            # Sometimes the model wraps JSON in markdown code blocks
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            candidate_data = json.loads(response_text)
-            return candidate_data
+            return orjson.loads(response_text)
         
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {e}")
-            logger.error(f"Response text: {response_text[:500]}")
-            raise ValueError("Failed to parse structured data from AI response")
+        except orjson.JSONDecodeError as e:
+            logger.warning("Failed to parse JSON response: %s", e)
+            logger.warning("Response text: %.500s", response_text)
+        
+        # Nearly valid JSON (truncated, trailing commas, stray prose) is often repairable
+        if json_repair is not None:
+            repaired = json_repair.loads(response_text)
+            if isinstance(repaired, dict) and repaired:
+                logger.info("Recovered candidate data from malformed JSON")
+                return repaired
+        
+        return None
+    
+    @staticmethod
+    def _merge_candidate_data(pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Combine candidate data extracted from individual resume pages
+        
+        Args:
+            pages: Extracted data of each page, in page order
+        
+        Returns:
+            Single candidate data dictionary covering all pages
+        """
+        merged: Dict[str, Any] = {
+            field: next((page[field] for page in pages if page.get(field) is not None), None)
+            for field in PROFILE_SCALAR_FIELDS
+        }
+        if merged["name"] is None:
+            del merged["name"]
+        
+        for field in PROFILE_LIST_FIELDS:
+            merged[field] = [entry for page in pages for entry in page.get(field) or []]
+        
+        # Skills repeat across pages; keep each once, in first-seen order
+        skills: Dict[str, Dict[str, None]] = {}
+        for page in pages:
+            for category, values in (page.get("skills") or {}).items():
+                skills.setdefault(category, {}).update(dict.fromkeys(values or []))
+        merged["skills"] = {category: list(values) for category, values in skills.items()}
+        
+        return merged
     
     def _parse_candidate_data(self, data: Dict[str, Any]) -> CandidateProfile:
         """
         Parse raw extracted data into a CandidateProfile object
         
+        Missing fields are filled in first, then the whole profile, including
+        every nested entry, is validated in a single pydantic pass.
+        
         Args:
             data: Raw dictionary from AI response
         
@@ -154,73 +481,27 @@ Focus on technical skills, programming languages, frameworks, and experience rel
             Validated CandidateProfile object
         """
         try:
-            # Parse skills
-            skills_data = data.get("skills", {})
-            skills = ResumeSkills(
-                languages=skills_data.get("languages", []),
-                frameworks=skills_data.get("frameworks", []),
-                tools=skills_data.get("tools", []),
-                databases=skills_data.get("databases", []),
-                cloud_platforms=skills_data.get("cloud_platforms", [])
-            )
-            
-            # Parse experience
-            experience = [
-                WorkExperience(
-                    company=exp.get("company", ""),
-                    position=exp.get("position", ""),
-                    duration=exp.get("duration", ""),
-                    description=exp.get("description", "")
-                )
-                for exp in data.get("experience", [])
-            ]
-            
-            # Parse education
-            education = [
-                Education(
-                    institution=edu.get("institution", ""),
-                    degree=edu.get("degree", ""),
-                    field=edu.get("field"),
-                    graduation_year=edu.get("graduation_year")
-                )
-                for edu in data.get("education", [])
-            ]
-            
-            # Parse projects
-            projects = [
-                Project(
-                    name=proj.get("name", ""),
-                    description=proj.get("description", ""),
-                    technologies=proj.get("technologies", [])
-                )
-                for proj in data.get("projects", [])
-            ]
-            
-            # Create profile
-            profile = CandidateProfile(
-                name=data.get("name", "Unknown Candidate"),
-                email=data.get("email"),
-                phone=data.get("phone"),
-                summary=data.get("summary"),
-                skills=skills,
-                experience=experience,
-                education=education,
-                projects=projects,
-                years_of_experience=data.get("years_of_experience")
-            )
-            
-            return profile
+            # The prompt allows null for anything unavailable; treat it like a missing key
+            return CandidateProfile.model_validate({
+                **data,
+                "name": data.get("name") or "Unknown Candidate",
+                "skills": _non_null(data.get("skills") or {}),
+                "experience": [
+                    {**EXPERIENCE_DEFAULTS, **_non_null(exp)} for exp in data.get("experience") or []
+                ],
+                "education": [
+                    {**EDUCATION_DEFAULTS, **_non_null(edu)} for edu in data.get("education") or []
+                ],
+                "projects": [
+                    {**PROJECT_DEFAULTS, **_non_null(proj)} for proj in data.get("projects") or []
+                ]
+            })
         
         except Exception as e:
-            logger.error(f"Error parsing candidate data: {str(e)}")
+            logger.error("Error parsing candidate data: %s", e)
             raise ValueError(f"Failed to create candidate profile: {str(e)}")
     
     async def close(self):
         """Clean up resources"""
         await self.nvidia_client.close()
 
-
-# Note: pdf2image requires poppler-utils to be installed on the system
-# For macOS: brew install poppler
-# For Ubuntu: sudo apt-get install poppler-utils
-
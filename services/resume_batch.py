@@ -0,0 +1,108 @@
+"""
+Bulk Resume Analysis
+
+This module analyzes many resumes at once (e.g. every applicant for a role)
+outside the web service. PDFs are spread across worker processes, each with
+its own event loop, NVIDIA client and connection pool, and every worker keeps
+several VLM requests in flight. Throughput scales with the number of workers
+until the endpoint starts rate-limiting, which the client retries with backoff.
+
+Usage:
+    python -m services.resume_batch resume1.pdf resume2.pdf ...
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Union
+from services.nvidia_client import shutdown_client
+from services.resume_analyzer import ResumeAnalyzer
+from models.schemas import CandidateProfile
+
+
+logger = logging.getLogger(__name__)
+
+AnalysisResult = Union[CandidateProfile, Exception]
+
+
+async def _analyze_paths(pdf_paths: Sequence[str], concurrency: int) -> List[AnalysisResult]:
+    """Analyze PDFs concurrently on this process's event loop"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def analyze(analyzer: ResumeAnalyzer, pdf_path: str) -> CandidateProfile:
+        async with semaphore:
+            return await analyzer.analyze_pdf_file(pdf_path)
+
+    try:
+        try:
+            analyzer = ResumeAnalyzer()
+        except Exception as e:
+            # e.g. NVIDIA_API_KEY missing: every PDF in this share fails the same way
+            return [e] * len(pdf_paths)
+        return await asyncio.gather(
+            *(analyze(analyzer, path) for path in pdf_paths),
+            return_exceptions=True
+        )
+    finally:
+        # The shared client is bound to this event loop, which closes after the run
+        await shutdown_client()
+
+
+def _analyze_chunk(pdf_paths: Sequence[str], concurrency: int) -> List[AnalysisResult]:
+    """Worker process entry point: analyze one share of the PDFs"""
+    results = asyncio.run(_analyze_paths(pdf_paths, concurrency))
+    # Client exceptions are not always picklable; send back their message instead
+    return [
+        result if isinstance(result, CandidateProfile)
+        else RuntimeError(f"{type(result).__name__}: {result}")
+        for result in results
+    ]
+
+
+def analyze_resumes(
+    pdf_paths: Sequence[str],
+    processes: Optional[int] = None,
+    concurrency: int = 4
+) -> List[AnalysisResult]:
+    """
+    Analyze a batch of PDF resumes in parallel worker processes
+
+    Args:
+        pdf_paths: Paths of the PDF files to analyze
+        processes: Number of worker processes (defaults to the CPU count)
+        concurrency: Maximum in-flight analyses per worker process
+
+    Returns:
+        CandidateProfile for each PDF, or the exception its analysis raised,
+        in the order of pdf_paths
+    """
+    if not pdf_paths:
+        return []
+
+    processes = max(1, min(processes or os.cpu_count() or 1, len(pdf_paths)))
+    # Round-robin shares keep the workers evenly loaded
+    shares = [list(pdf_paths[index::processes]) for index in range(processes)]
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        share_results = list(pool.map(_analyze_chunk, shares, [concurrency] * processes))
+
+    results: List[AnalysisResult] = [None] * len(pdf_paths)
+    for index, share_result in enumerate(share_results):
+        results[index::processes] = share_result
+    return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    paths = sys.argv[1:]
+    for path, result in zip(paths, analyze_resumes(paths)):
+        if isinstance(result, Exception):
+            logger.error("%s: %s", path, result)
+        else:
+            print(result.model_dump_json())
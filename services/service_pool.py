@@ -0,0 +1,68 @@
+"""
+Service Object Pool
+
+This module provides a small asyncio pool for reusing stateless service
+objects (ResumeAnalyzer, AssessmentEngine) across requests, so they are not
+rebuilt on every call and the number of concurrent analyses stays bounded.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Generic, List, TypeVar
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ServicePool(Generic[T]):
+    """
+    Bounded pool of reusable service instances
+
+    Instances are created on demand up to `size`; once the pool is full,
+    callers wait for an instance to be returned. Instances are only closed
+    when the pool itself is closed.
+    """
+
+    def __init__(self, factory: Callable[[], T], size: int):
+        """
+        Initialize the pool
+
+        Args:
+            factory: Callable that builds a new service instance
+            size: Maximum number of instances the pool will create
+        """
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1, got {size}")
+
+        self.factory = factory
+        self.size = size
+        self._idle: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self._instances: List[T] = []
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[T]:
+        """Borrow an instance from the pool for the duration of the context"""
+        if self._idle.empty() and len(self._instances) < self.size:
+            # Construction errors (e.g. missing API key) propagate to the caller
+            instance = self.factory()
+            self._instances.append(instance)
+        else:
+            instance = await self._idle.get()
+
+        try:
+            yield instance
+        finally:
+            self._idle.put_nowait(instance)
+
+    async def close(self):
+        """Close every instance created by the pool"""
+        for instance in self._instances:
+            try:
+                await instance.close()
+            except Exception as e:
+                logger.error("Error closing pooled %s: %s", type(instance).__name__, e)
+        self._instances.clear()
+        self._idle = asyncio.Queue(maxsize=self.size)
@@ -0,0 +1,363 @@
+"""
+Interview Session Store
+
+This module persists interview sessions between requests. Sessions are stored
+as serialized InterviewAgent state so they can be shared across uvicorn workers
+(Redis) and expire automatically instead of accumulating in process memory.
+The same backend also holds short-lived cached values (e.g. analysis results).
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import AsyncContextManager, Dict, List, Optional, Set, Tuple
+import orjson
+from redis.asyncio import Redis
+from config.app_config import AppConfig
+from services.interview_agent import InterviewAgent
+from services.nim_batcher import NIMBatcher
+from services.nvidia_client import max_request_seconds
+
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStoreFullError(Exception):
+    """Raised when a new session cannot be stored because the store is at capacity"""
+
+
+class SessionStore(ABC):
+    """
+    Base interface for interview session storage
+
+    Active sessions expire ttl_seconds after their last activity. Completed
+    sessions are additionally kept no longer than completed_ttl_seconds after
+    the interview completed.
+    """
+
+    def __init__(self, ttl_seconds: int, completed_ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.completed_ttl_seconds = completed_ttl_seconds
+
+    def _expiry_seconds(self, agent: InterviewAgent) -> int:
+        """Seconds from now until a freshly saved session should expire"""
+        now = datetime.now()
+        remaining = self.ttl_seconds - (now - agent.last_activity).total_seconds()
+        if agent.status == "completed":
+            # Sessions saved before completed_at was recorded completed at their last activity
+            completed_at = agent.completed_at or agent.last_activity
+            remaining = min(
+                remaining,
+                self.completed_ttl_seconds - (now - completed_at).total_seconds()
+            )
+        return max(1, int(remaining))
+
+    @abstractmethod
+    async def get(
+        self,
+        session_id: str,
+        batcher: Optional[NIMBatcher] = None
+    ) -> Optional[InterviewAgent]:
+        """
+        Load a session, returning None if it does not exist or has expired
+
+        Args:
+            session_id: Interview session ID
+            batcher: Shared request batcher handed to the restored agent
+        """
+
+    @abstractmethod
+    async def save(self, agent: InterviewAgent) -> None:
+        """
+        Create or update a session and reset its expiration
+
+        Raises:
+            SessionStoreFullError: If a new session would exceed the store's capacity
+        """
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """Remove a session"""
+
+    @abstractmethod
+    def lock(self, session_id: str) -> AsyncContextManager:
+        """
+        Exclusive lock serializing load-modify-save cycles on one session
+
+        Readers do not need the lock: every load returns an independent
+        agent built from the last saved state.
+        """
+
+    @abstractmethod
+    async def session_ids(self) -> List[str]:
+        """List the IDs of all stored sessions"""
+
+    async def count(self) -> int:
+        """Number of stored sessions"""
+        return len(await self.session_ids())
+
+    async def sweep(self) -> int:
+        """
+        Remove expired sessions
+
+        Returns:
+            Number of sessions removed
+        """
+        return 0
+
+    @abstractmethod
+    async def get_value(self, key: str) -> Optional[str]:
+        """Read a cached value, returning None if missing or expired"""
+
+    @abstractmethod
+    async def set_value(self, key: str, value: str, ttl_seconds: int) -> None:
+        """Store a cached value that expires after ttl_seconds"""
+
+    @abstractmethod
+    async def delete_value(self, key: str) -> None:
+        """Remove a cached value"""
+
+    async def close(self) -> None:
+        """Release any resources held by the store"""
+
+
+class RedisSessionStore(SessionStore):
+    """Session store backed by Redis with TTL-based expiration"""
+
+    KEY_PREFIX = "sess:"
+    LOCK_PREFIX = "sess_lock:"
+
+    # Time allowed on top of the LLM call for loading and saving the session
+    LOCK_MARGIN_SECONDS = 15
+
+    def __init__(
+        self,
+        redis_url: str,
+        ttl_seconds: int,
+        completed_ttl_seconds: int,
+        max_connections: int
+    ):
+        super().__init__(ttl_seconds, completed_ttl_seconds)
+        # Upper bound on how long a holder may keep a session locked; the lock
+        # is released automatically after this, so it must outlast the slowest
+        # possible LLM call including every retry
+        self.lock_timeout_seconds = max_request_seconds() + self.LOCK_MARGIN_SECONDS
+        self.redis = Redis.from_url(
+            redis_url,
+            max_connections=max_connections,
+            decode_responses=True
+        )
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.KEY_PREFIX}{session_id}"
+
+    async def get(
+        self,
+        session_id: str,
+        batcher: Optional[NIMBatcher] = None
+    ) -> Optional[InterviewAgent]:
+        raw = await self.redis.get(self._key(session_id))
+        if raw is None:
+            return None
+        return InterviewAgent.from_dict(orjson.loads(raw), batcher)
+
+    async def save(self, agent: InterviewAgent) -> None:
+        await self.redis.set(
+            self._key(agent.session_id),
+            orjson.dumps(agent.to_dict()),
+            ex=self._expiry_seconds(agent)
+        )
+
+    async def delete(self, session_id: str) -> None:
+        await self.redis.delete(self._key(session_id))
+
+    def lock(self, session_id: str) -> AsyncContextManager:
+        # Shared by every worker, unlike an in-process asyncio.Lock
+        return self.redis.lock(
+            f"{self.LOCK_PREFIX}{session_id}",
+            timeout=self.lock_timeout_seconds
+        )
+
+    async def session_ids(self) -> List[str]:
+        prefix_length = len(self.KEY_PREFIX)
+        return [
+            key[prefix_length:]
+            async for key in self.redis.scan_iter(match=f"{self.KEY_PREFIX}*")
+        ]
+
+    async def get_value(self, key: str) -> Optional[str]:
+        return await self.redis.get(key)
+
+    async def set_value(self, key: str, value: str, ttl_seconds: int) -> None:
+        await self.redis.set(key, value, ex=ttl_seconds)
+
+    async def delete_value(self, key: str) -> None:
+        await self.redis.delete(key)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Single-process session store for local development
+
+    Sessions are kept serialized, exactly as they would be in Redis, so both
+    backends hand out independent InterviewAgent instances on every load.
+    Expired entries are dropped on access and by sweep(); Redis needs no
+    sweeping because key TTLs reclaim them server-side.
+
+    At most max_sessions are held. When a new session arrives at capacity,
+    expired sessions are dropped first, then the least recently saved
+    completed session; active interviews are never evicted.
+    """
+
+    def __init__(self, ttl_seconds: int, completed_ttl_seconds: int, max_sessions: int):
+        super().__init__(ttl_seconds, completed_ttl_seconds)
+        self.max_sessions = max_sessions
+        # session_id -> (expires_at monotonic timestamp, serialized state),
+        # ordered from least to most recently saved
+        self._sessions: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._completed: Set[str] = set()
+        # cache key -> (expires_at monotonic timestamp, value)
+        self._values: Dict[str, Tuple[float, str]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def _live(entries: Dict[str, Tuple[float, str]], key: str) -> Optional[str]:
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        expires_at, raw = entry
+        if expires_at <= time.monotonic():
+            del entries[key]
+            return None
+        return raw
+
+    def _live_entry(self, session_id: str) -> Optional[bytes]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        expires_at, raw = entry
+        if expires_at <= time.monotonic():
+            self._forget(session_id)
+            return None
+        return raw
+
+    async def get(
+        self,
+        session_id: str,
+        batcher: Optional[NIMBatcher] = None
+    ) -> Optional[InterviewAgent]:
+        raw = self._live_entry(session_id)
+        if raw is None:
+            return None
+        return InterviewAgent.from_dict(orjson.loads(raw), batcher)
+
+    async def save(self, agent: InterviewAgent) -> None:
+        session_id = agent.session_id
+        if session_id not in self._sessions and len(self._sessions) >= self.max_sessions:
+            self._make_room()
+
+        self._sessions[session_id] = (
+            time.monotonic() + self._expiry_seconds(agent),
+            orjson.dumps(agent.to_dict())
+        )
+        self._sessions.move_to_end(session_id)
+        if agent.status == "completed":
+            self._completed.add(session_id)
+        else:
+            self._completed.discard(session_id)
+
+    def _make_room(self):
+        """Free one slot, preferring expired sessions over completed ones"""
+        if self._expire(time.monotonic()):
+            return
+
+        for session_id in self._sessions:
+            if session_id in self._completed:
+                logger.info("Session store full, evicting completed session %s", session_id)
+                self._forget(session_id)
+                return
+
+        raise SessionStoreFullError(
+            f"Session store is at capacity ({self.max_sessions} active sessions)"
+        )
+
+    def _forget(self, session_id: str):
+        """Drop a session and its bookkeeping"""
+        self._sessions.pop(session_id, None)
+        self._completed.discard(session_id)
+        self._locks.pop(session_id, None)
+
+    async def delete(self, session_id: str) -> None:
+        self._forget(session_id)
+
+    def lock(self, session_id: str) -> AsyncContextManager:
+        # Unknown IDs get a throwaway lock; the caller's load then finds no
+        # session, and client-supplied IDs never accumulate locks
+        if self._live_entry(session_id) is None:
+            return asyncio.Lock()
+        return self._locks.setdefault(session_id, asyncio.Lock())
+
+    async def session_ids(self) -> List[str]:
+        return [
+            session_id for session_id in list(self._sessions)
+            if self._live_entry(session_id) is not None
+        ]
+
+    async def sweep(self) -> int:
+        now = time.monotonic()
+        expired_values = [key for key, (expires_at, _) in self._values.items() if expires_at <= now]
+        for key in expired_values:
+            del self._values[key]
+
+        return self._expire(now)
+
+    def _expire(self, now: float) -> int:
+        """Drop sessions that expired by now, returning how many were removed"""
+        expired_sessions = [
+            session_id for session_id, (expires_at, _) in self._sessions.items()
+            if expires_at <= now
+        ]
+        for session_id in expired_sessions:
+            self._forget(session_id)
+        return len(expired_sessions)
+
+    async def get_value(self, key: str) -> Optional[str]:
+        return self._live(self._values, key)
+
+    async def set_value(self, key: str, value: str, ttl_seconds: int) -> None:
+        self._values[key] = (time.monotonic() + ttl_seconds, value)
+
+    async def delete_value(self, key: str) -> None:
+        self._values.pop(key, None)
+
+
+def create_session_store(config: AppConfig) -> SessionStore:
+    """
+    Create the session store selected by SESSION_BACKEND
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        Redis-backed store, or in-memory store when SESSION_BACKEND=memory
+    """
+    if config.session_backend == "memory":
+        logger.warning("Using in-memory session store; sessions are not shared across workers")
+        return InMemorySessionStore(
+            config.session_ttl_seconds,
+            config.completed_session_ttl_seconds,
+            max_sessions=config.max_sessions
+        )
+
+    return RedisSessionStore(
+        config.redis_url,
+        ttl_seconds=config.session_ttl_seconds,
+        completed_ttl_seconds=config.completed_session_ttl_seconds,
+        max_connections=config.redis_max_connections
+    )
@@ -0,0 +1,15 @@
+"""
+Test configuration
+
+The application reads its settings from the environment when first imported,
+so the test defaults are applied here, before any test module imports it.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("SESSION_BACKEND", "memory")
+os.environ.setdefault("NVIDIA_API_KEY", "test-key")
@@ -0,0 +1,27 @@
+"""
+Tests for the model output helpers
+"""
+
+from utils.model_output import strip_json_fence
+
+
+def test_json_block_wins_over_earlier_block():
+    text = (
+        "Here is how I read the resume:\n"
+        "```text\nSenior engineer, 8 years of Python\n```\n"
+        "```json\n{\"name\": \"Ada\"}\n```"
+    )
+    assert strip_json_fence(text) == '{"name": "Ada"}'
+
+
+def test_first_block_used_without_json_tag():
+    text = "```python\n{\"name\": \"Ada\"}\n```\n```\n{\"name\": \"Grace\"}\n```"
+    assert strip_json_fence(text) == '{"name": "Ada"}'
+
+
+def test_unclosed_json_block():
+    assert strip_json_fence("```json\n{\"name\": \"Ada\"}") == '{"name": "Ada"}'
+
+
+def test_text_without_fence_is_unchanged():
+    assert strip_json_fence('{"name": "Ada"}') == '{"name": "Ada"}'
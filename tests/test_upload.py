@@ -0,0 +1,25 @@
+"""
+Tests for the resume upload endpoint
+"""
+
+import pytest
+
+pytest.importorskip("fitz")
+from fastapi.testclient import TestClient
+from backend.main import app
+
+
+def test_corrupt_pdf_is_rejected_without_leaking_paths():
+    corrupt_pdf = b"%PDF-1.4\nthis is not really a PDF\n"
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/upload-resume",
+            params={"job_description": "Senior Python Engineer"},
+            files={"file": ("resume.pdf", corrupt_pdf, "application/pdf")}
+        )
+
+    assert response.status_code == 400
+    assert "damaged" in response.json()["detail"]
+    assert "/tmp" not in response.text
+    assert ".pdf'" not in response.text
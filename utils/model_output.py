@@ -0,0 +1,27 @@
+"""
+Model Output Helpers
+
+Shared parsing helpers for text returned by the chat models.
+"""
+
+import re
+
+
+# Body of a markdown code block tagged json, up to its closing fence or the
+# end of the text if the model never closed it
+JSON_FENCE_PATTERN = re.compile(r"```json\b\s*(.*?)(?:```|\Z)", re.DOTALL | re.IGNORECASE)
+
+# Body of a markdown code block with any (or no) language tag
+CODE_FENCE_PATTERN = re.compile(r"```[\w+-]*\s*(.*?)(?:```|\Z)", re.DOTALL)
+
+
+def strip_json_fence(text: str) -> str:
+    """
+    Return the JSON payload of a model response
+
+    Models sometimes put an example or explanation in its own code block, so
+    a block tagged json wins over an earlier untagged or other-language one.
+    Falls back to the first code block, then to text unchanged.
+    """
+    match = JSON_FENCE_PATTERN.search(text) or CODE_FENCE_PATTERN.search(text)
+    return match.group(1).strip() if match else text